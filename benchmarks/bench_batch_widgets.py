@@ -0,0 +1,89 @@
+"""Benchmark for loading widgets one request at a time vs with the batch endpoint.
+
+    python benchmarks/bench_batch_widgets.py --widgets 50000 --single 500
+"""
+import argparse
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from flask_api_tutorial import create_app, db
+from flask_api_tutorial.models.user import User
+from flask_api_tutorial.models.widget import Widget
+
+EMAIL = "benchmark@email.com"
+PASSWORD = "benchmark"
+DEADLINE = (date.today() + timedelta(days=30)).strftime("%m/%d/%y")
+
+
+def setup_app(db_path):
+    app = create_app("development")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(email=EMAIL, password=PASSWORD, admin=True))
+        db.session.commit()
+    return app
+
+
+def login(client):
+    response = client.post(
+        "/api/v1/auth/login", data=dict(email=EMAIL, password=PASSWORD)
+    )
+    return {"Authorization": f"Bearer {response.get_json()['access_token']}"}
+
+
+def load_one_by_one(client, headers, num_widgets):
+    start = time.perf_counter()
+    for i in range(num_widgets):
+        form = dict(name=f"single-{i}", info_url="https://www.a.com", deadline=DEADLINE)
+        response = client.post("/api/v1/widgets", data=form, headers=headers)
+        assert response.status_code == 201
+    return time.perf_counter() - start
+
+
+def load_batch(client, headers, num_widgets):
+    operations = [
+        dict(
+            op="create",
+            name=f"batch-{i}",
+            info_url="https://www.a.com",
+            deadline=DEADLINE,
+        )
+        for i in range(num_widgets)
+    ]
+    start = time.perf_counter()
+    response = client.post(
+        "/api/v1/widgets/batch", json=dict(operations=operations), headers=headers
+    )
+    assert response.status_code == 200 and response.get_json()["failed"] == 0
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--widgets", type=int, default=50000)
+    parser.add_argument("--single", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = setup_app(Path(tmp_dir) / "bench_batch.db")
+        with app.test_client() as client:
+            headers = login(client)
+            single = load_one_by_one(client, headers, args.single)
+            batch = load_batch(client, headers, args.widgets)
+        with app.app_context():
+            assert Widget.query.count() == args.single + args.widgets
+    print(
+        f"one request per widget: {args.single} widgets in {single:6.2f} s "
+        f"({args.single / single:8.0f} widgets/s)"
+    )
+    print(
+        f"batch endpoint:         {args.widgets} widgets in {batch:6.2f} s "
+        f"({args.widgets / batch:8.0f} widgets/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
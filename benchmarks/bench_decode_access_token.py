@@ -0,0 +1,57 @@
+"""Micro-benchmark for the per-request cost of validating an access token.
+
+Compares User.decode_access_token with the verified-token cache disabled (every
+call runs jwt.decode and HMAC verification) and enabled. The blacklist check runs
+in both cases.
+
+    python benchmarks/bench_decode_access_token.py --iterations 20000
+"""
+import argparse
+import timeit
+
+from flask_api_tutorial import create_app, db
+from flask_api_tutorial.models.user import User, access_token_cache
+
+EMAIL = "benchmark@email.com"
+PASSWORD = "benchmark"
+
+
+def setup_app():
+    app = create_app("development")
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    return app
+
+
+def bench_decode(auth_header, iterations, repeat, cache_size):
+    access_token_cache.max_size = cache_size
+    access_token_cache.clear()
+    timings = timeit.repeat(
+        lambda: User.decode_access_token(auth_header), number=iterations, repeat=repeat
+    )
+    return min(timings) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    app = setup_app()
+    with app.app_context():
+        db.create_all()
+        user = User(email=EMAIL, password=PASSWORD)
+        db.session.add(user)
+        db.session.commit()
+        auth_header = f"Bearer {user.encode_access_token().decode()}"
+        assert User.decode_access_token(auth_header).success
+
+        uncached = bench_decode(auth_header, args.iterations, args.repeat, 0)
+        cached = bench_decode(auth_header, args.iterations, args.repeat, 1024)
+    print(f"decode_access_token, cache disabled: {uncached:8.2f} us/call")
+    print(f"decode_access_token, cache enabled:  {cached:8.2f} us/call")
+    print(f"speedup: {uncached / cached:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
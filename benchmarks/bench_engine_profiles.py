@@ -0,0 +1,115 @@
+"""Benchmark concurrent SQLite reads and writes with each database engine profile.
+
+Every worker thread runs its own sessions against the same SQLite file, mixing
+widget list queries with widget updates. The baseline ("none") uses the
+Flask-SQLAlchemy defaults: a new connection per checkout and the rollback journal.
+
+    python benchmarks/bench_engine_profiles.py --workers 8 --operations 500
+"""
+import argparse
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+
+from sqlalchemy.exc import OperationalError
+
+from flask_api_tutorial import create_app, db
+from flask_api_tutorial.models.user import User
+from flask_api_tutorial.models.widget import Widget
+from flask_api_tutorial.util.datetime_util import utc_now
+from flask_api_tutorial.util.metrics import LatencyStats
+
+NUM_WIDGETS = 1000
+PROFILES = ("none", "default", "production")
+
+
+def setup_app(db_path, profile):
+    app = create_app("development")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
+    app.config["DATABASE_ENGINE_PROFILE"] = None if profile == "none" else profile
+    with app.app_context():
+        db.create_all()
+        user = User(email="benchmark@email.com", password="benchmark")
+        db.session.add(user)
+        db.session.flush()
+        deadline = utc_now() + timedelta(days=30)
+        db.session.bulk_insert_mappings(
+            Widget,
+            [
+                dict(
+                    name=f"widget-{i}",
+                    info_url=f"https://www.widget{i}.com",
+                    deadline=deadline,
+                    owner_id=user.id,
+                )
+                for i in range(NUM_WIDGETS)
+            ],
+        )
+        db.session.commit()
+    return app
+
+
+def run_worker(app, worker, num_operations, write_every, latency):
+    errors = 0
+    with app.app_context():
+        for i in range(num_operations):
+            start = time.perf_counter()
+            try:
+                if i % write_every:
+                    Widget.query.order_by(*Widget.list_order()).limit(10).all()
+                else:
+                    widget_id = (worker * num_operations + i) % NUM_WIDGETS + 1
+                    Widget.query.filter_by(id=widget_id).update(
+                        dict(info_url=f"https://www.widget{i}.org")
+                    )
+                    db.session.commit()
+            except OperationalError:
+                db.session.rollback()
+                errors += 1
+            finally:
+                db.session.remove()
+            latency.record(time.perf_counter() - start)
+    return errors
+
+
+def run_benchmark(app, num_workers, num_operations, write_every):
+    latency = LatencyStats(max_samples=num_workers * num_operations)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        futures = [
+            executor.submit(
+                run_worker, app, worker, num_operations, write_every, latency
+            )
+            for worker in range(num_workers)
+        ]
+        errors = sum(future.result() for future in futures)
+    elapsed = time.perf_counter() - start
+    return dict(
+        operations_per_sec=latency.count / elapsed, errors=errors, **latency.summary()
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--operations", type=int, default=500, help="per worker")
+    parser.add_argument("--write-every", type=int, default=5, help="1 write per N ops")
+    args = parser.parse_args()
+
+    for profile in PROFILES:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            app = setup_app(Path(tmp_dir) / "bench_engine.db", profile)
+            result = run_benchmark(app, args.workers, args.operations, args.write_every)
+            with app.app_context():
+                db.engine.dispose()
+        print(
+            f"{profile:>10}: {result['operations_per_sec']:8.1f} ops/s, "
+            f"p50 {result['p50_ms']:6.2f} ms, p95 {result['p95_ms']:6.2f} ms, "
+            f"p99 {result['p99_ms']:7.2f} ms, {result['errors']} locked errors"
+        )
+
+
+if __name__ == "__main__":
+    main()
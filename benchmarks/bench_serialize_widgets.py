@@ -0,0 +1,81 @@
+"""Micro-benchmark for serializing a page of widgets.
+
+Compares flask_restx.marshal with the serializer compiled from the same
+pagination_model, for one page of widgets loaded with their owners.
+
+    python benchmarks/bench_serialize_widgets.py --per-page 100
+"""
+import argparse
+import timeit
+from datetime import timedelta
+
+from flask_restx import marshal
+from sqlalchemy.orm import joinedload
+
+from flask_api_tutorial import create_app, db, request_clock
+from flask_api_tutorial.api.widgets.dto import pagination_model, serialize_pagination
+from flask_api_tutorial.models.user import User
+from flask_api_tutorial.models.widget import Widget
+from flask_api_tutorial.util.datetime_util import utc_now
+from flask_api_tutorial.util.pagination import OffsetPagination
+
+EMAIL = "benchmark@email.com"
+PASSWORD = "benchmark"
+
+
+def setup_app():
+    app = create_app("development")
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    return app
+
+
+def seed_widgets(num_widgets):
+    user = User(email=EMAIL, password=PASSWORD, admin=True)
+    db.session.add(user)
+    db.session.flush()
+    deadline = utc_now() + timedelta(days=30)
+    for i in range(num_widgets):
+        widget = Widget(
+            name=f"widget-{i}",
+            info_url=f"https://www.widget{i}.com",
+            deadline=deadline,
+            owner_id=user.id,
+        )
+        db.session.add(widget)
+    db.session.commit()
+
+
+def bench(func, iterations, repeat):
+    timings = timeit.repeat(func, number=iterations, repeat=repeat)
+    return min(timings) / iterations * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--per-page", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    app = setup_app()
+    with app.test_request_context():
+        db.create_all()
+        seed_widgets(args.per_page)
+        query = Widget.query.options(joinedload(Widget.owner))
+        pagination = OffsetPagination(query, 1, args.per_page, args.per_page, "exact")
+        request_clock.take_snapshot()
+
+        marshalled = bench(
+            lambda: marshal(pagination, pagination_model), args.iterations, args.repeat
+        )
+        compiled = bench(
+            lambda: serialize_pagination(pagination), args.iterations, args.repeat
+        )
+    print(f"per_page={args.per_page}")
+    print(f"marshal:             {marshalled:8.2f} ms/page")
+    print(f"compiled serializer: {compiled:8.2f} ms/page")
+    print(f"speedup: {marshalled / compiled:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
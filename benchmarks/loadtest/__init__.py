@@ -0,0 +1,5 @@
+"""Load-testing suite that measures API throughput and latency per scenario.
+
+    python -m benchmarks.loadtest --mode both --clients 8 --requests 50 \
+        --output results.json --baseline previous.json
+"""
@@ -0,0 +1,244 @@
+"""Run load-test scenarios against the API in-process and/or through a WSGI server.
+
+Every mode starts from a new SQLite database seeded with users and widgets. Each
+scenario runs --clients threads that send --requests measured requests each, and
+reports requests/sec plus p50/p95/p99/max latency. Results can be saved as JSON and
+compared with the results of a previous run.
+
+The WSGI server is multi-threaded by default; --server single runs it with one
+thread and --server both compares the two. The response cache is disabled unless
+--response-cache is given, so the widget_list_* scenarios measure the database
+query and serialization rather than cache hits.
+
+    python -m benchmarks.loadtest --mode both --output results.json
+    python -m benchmarks.loadtest --scenario widget_list_10 --baseline results.json
+    python -m benchmarks.loadtest --mode wsgi --server both --clients 16
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from flask_api_tutorial import create_app, db, response_cache
+from flask_api_tutorial.models.user import User
+from flask_api_tutorial.models.widget import Widget
+from flask_api_tutorial.util.datetime_util import utc_now
+from flask_api_tutorial.util.metrics import percentile
+
+from benchmarks.loadtest.clients import InProcessClient, WsgiClient, WsgiServer
+from benchmarks.loadtest.scenarios import (
+    ADMIN_EMAIL,
+    NUM_WIDGETS,
+    PASSWORD,
+    SCENARIOS,
+    user_email,
+)
+
+MODES = ("inprocess", "wsgi")
+SERVERS = dict(threaded=True, single=False)
+
+
+def create_loadtest_app(db_path, args):
+    app = create_app("development")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
+    app.config["BCRYPT_LOG_ROUNDS"] = args.bcrypt_rounds
+    app.config["RESPONSE_CACHE"] = "memory" if args.response_cache else None
+    response_cache.init_app(app)
+    assert response_cache.enabled == args.response_cache
+    seed_database(app, args.clients)
+    return app
+
+
+def seed_database(app, num_clients):
+    with app.app_context():
+        db.create_all()
+        admin = User(email=ADMIN_EMAIL, password=PASSWORD, admin=True)
+        db.session.add(admin)
+        for client_index in range(num_clients):
+            db.session.add(User(email=user_email(client_index), password=PASSWORD))
+        db.session.flush()
+        deadline = utc_now() + timedelta(days=30)
+        db.session.bulk_insert_mappings(
+            Widget,
+            [
+                dict(
+                    name=f"widget-{i}",
+                    info_url=f"https://www.widget{i}.com",
+                    deadline=deadline,
+                    owner_id=admin.id,
+                )
+                for i in range(NUM_WIDGETS)
+            ],
+        )
+        db.session.commit()
+
+
+def run_client(make_client, scenario, client_index, num_requests):
+    client = make_client()
+    latencies, errors = [], 0
+    try:
+        state = scenario.setup(client, client_index)
+        for i in range(num_requests):
+            start = time.perf_counter()
+            status = scenario.step(client, state, i)
+            latencies.append(time.perf_counter() - start)
+            if status >= 400:
+                errors += 1
+    finally:
+        client.close()
+    return latencies, errors
+
+
+def run_scenario(make_client, scenario, num_clients, num_requests):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=num_clients) as executor:
+        futures = [
+            executor.submit(run_client, make_client, scenario, i, num_requests)
+            for i in range(num_clients)
+        ]
+        results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - start
+    latencies = sorted(latency for client, _ in results for latency in client)
+    return dict(
+        requests=len(latencies),
+        errors=sum(errors for _, errors in results),
+        requests_per_sec=len(latencies) / elapsed,
+        p50_ms=percentile(latencies, 50) * 1000,
+        p95_ms=percentile(latencies, 95) * 1000,
+        p99_ms=percentile(latencies, 99) * 1000,
+        max_ms=latencies[-1] * 1000 if latencies else 0.0,
+    )
+
+
+def run_mode(mode, scenarios, args):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = create_loadtest_app(Path(tmp_dir) / "loadtest.db", args)
+        if mode == "inprocess":
+            for scenario in scenarios:
+                result = run_scenario(
+                    lambda: InProcessClient(app), scenario, args.clients, args.requests
+                )
+                results.append(
+                    dict(scenario=scenario.name, mode=mode, server=None, **result)
+                )
+                print_result(results[-1])
+        else:
+            servers = SERVERS if args.server == "both" else (args.server,)
+            for server_name in servers:
+                with WsgiServer(app, threaded=SERVERS[server_name]) as server:
+                    for scenario in scenarios:
+                        result = run_scenario(
+                            lambda: WsgiClient(server.base_url),
+                            scenario,
+                            args.clients,
+                            args.requests,
+                        )
+                        results.append(
+                            dict(
+                                scenario=scenario.name,
+                                mode=mode,
+                                server=server_name,
+                                **result,
+                            )
+                        )
+                        print_result(results[-1])
+        with app.app_context():
+            db.engine.dispose()
+    return results
+
+
+def print_result(result, baseline=None):
+    label = result["mode"]
+    if result.get("server"):
+        label += f"/{result['server']}"
+    line = (
+        f"{result['scenario']:>16} {label:>15}: "
+        f"{result['requests_per_sec']:8.1f} req/s, p50 {result['p50_ms']:7.2f} ms, "
+        f"p95 {result['p95_ms']:7.2f} ms, p99 {result['p99_ms']:7.2f} ms, "
+        f"{result['errors']} errors"
+    )
+    if baseline:
+        line += (
+            f" | vs baseline: req/s {_change(result, baseline, 'requests_per_sec')}, "
+            f"p95 {_change(result, baseline, 'p95_ms')}"
+        )
+    print(line)
+
+
+def compare_with_baseline(results, baseline_path):
+    baseline = json.loads(Path(baseline_path).read_text())
+    previous = {_result_key(r): r for r in baseline["results"]}
+    settings = baseline.get("settings", {})
+    print(
+        f"\nCompared with {baseline_path} (commit {baseline.get('commit')}, "
+        f"response cache {'on' if settings.get('response_cache') else 'off'}):"
+    )
+    for result in results:
+        print_result(result, previous.get(_result_key(result)))
+
+
+def _result_key(result):
+    return result["scenario"], result["mode"], result.get("server")
+
+
+def _change(result, baseline, key):
+    if not baseline[key]:
+        return "n/a"
+    return f"{(result[key] - baseline[key]) / baseline[key] * 100:+.1f}%"
+
+
+def git_commit():
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True
+        )
+    except OSError:
+        return None
+    return completed.stdout.strip() or None
+
+
+def main():
+    scenario_names = [scenario.name for scenario in SCENARIOS]
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=[*MODES, "both"], default="both")
+    parser.add_argument("--scenario", nargs="*", choices=scenario_names)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=50, help="per client")
+    parser.add_argument("--bcrypt-rounds", type=int, default=10)
+    parser.add_argument("--server", choices=[*SERVERS, "both"], default="threaded")
+    parser.add_argument(
+        "--response-cache",
+        action="store_true",
+        help="serve GET /widgets from the in-memory response cache",
+    )
+    parser.add_argument("--output", help="save results to this JSON file")
+    parser.add_argument("--baseline", help="compare with results saved by --output")
+    args = parser.parse_args()
+
+    scenarios = [s for s in SCENARIOS if not args.scenario or s.name in args.scenario]
+    modes = MODES if args.mode == "both" else (args.mode,)
+    print(f"Response cache: {'memory' if args.response_cache else 'disabled'}")
+    results = [result for mode in modes for result in run_mode(mode, scenarios, args)]
+    if args.output:
+        report = dict(
+            commit=git_commit(),
+            created_at=datetime.now(timezone.utc).isoformat(),
+            python=platform.python_version(),
+            platform=sys.platform,
+            settings=vars(args),
+            results=results,
+        )
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    if args.baseline:
+        compare_with_baseline(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""HTTP clients that send requests to the app in-process or through a WSGI server."""
+import logging
+import threading
+
+import requests
+from werkzeug.serving import make_server
+
+
+class InProcessClient:
+    """Send requests through the Flask test client, without a network round-trip."""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, **kwargs):
+        """Status code and JSON body (None if empty) of the response."""
+        response = self.client.open(path, method=method, **kwargs)
+        return response.status_code, response.get_json(silent=True)
+
+    def close(self):
+        """Release resources held by the client."""
+
+
+class WsgiClient:
+    """Send requests over HTTP to a local WSGI server, reusing one connection."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.session = requests.Session()
+
+    def request(self, method, path, **kwargs):
+        """Status code and JSON body (None if empty) of the response."""
+        response = self.session.request(method, f"{self.base_url}{path}", **kwargs)
+        try:
+            return response.status_code, response.json()
+        except ValueError:
+            return response.status_code, None
+
+    def close(self):
+        """Close the HTTP connection."""
+        self.session.close()
+
+
+class WsgiServer:
+    """werkzeug server for app, listening on a random local port.
+
+    The server handles each request in a new thread unless threaded is False, in
+    which case requests are handled one at a time.
+    """
+
+    def __init__(self, app, threaded=True):
+        logging.getLogger("werkzeug").setLevel(logging.WARNING)
+        self.server = make_server("127.0.0.1", 0, app, threaded=threaded)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self._thread.join()
@@ -0,0 +1,96 @@
+"""Scripted load-test scenarios.
+
+Each scenario has a setup function, called once per simulated client, and a step
+function called for every measured request. setup returns the state (e.g. an
+access token) passed to step, step returns the response status code.
+"""
+from collections import namedtuple
+from datetime import date, timedelta
+
+from flask_api_tutorial.api.widgets.dto import pagination_reqparser
+
+Scenario = namedtuple("Scenario", ["name", "setup", "step"])
+
+API = "/api/v1"
+PASSWORD = "load_test"
+ADMIN_EMAIL = "admin@load.test"
+NUM_WIDGETS = 500
+DEADLINE = (date.today() + timedelta(days=30)).strftime("%m/%d/%y")
+
+
+def user_email(client_index):
+    return f"user{client_index}@load.test"
+
+
+def login(client, email):
+    status, body = client.request(
+        "POST", f"{API}/auth/login", data=dict(email=email, password=PASSWORD)
+    )
+    if status != 200:
+        raise RuntimeError(f"Login failed for {email}: {status} {body}")
+    return {"Authorization": f"Bearer {body['access_token']}"}
+
+
+def setup_login_storm(client, client_index):
+    return dict(email=user_email(client_index))
+
+
+def step_login_storm(client, state, i):
+    data = dict(email=state["email"], password=PASSWORD)
+    return client.request("POST", f"{API}/auth/login", data=data)[0]
+
+
+def setup_user_login(client, client_index):
+    return dict(headers=login(client, user_email(client_index)))
+
+
+def step_auth_user(client, state, i):
+    return client.request("GET", f"{API}/auth/user", headers=state["headers"])[0]
+
+
+def widget_list_step(per_page):
+    num_pages = -(-NUM_WIDGETS // per_page)
+
+    def step_widget_list(client, state, i):
+        path = f"{API}/widgets?per_page={per_page}&page={i % num_pages + 1}"
+        return client.request("GET", path, headers=state["headers"])[0]
+
+    return step_widget_list
+
+
+def setup_admin_login(client, client_index):
+    return dict(headers=login(client, ADMIN_EMAIL), prefix=f"load-{client_index}")
+
+
+def step_admin_writes(client, state, i):
+    """Create a widget, then update and finally delete it on the next two steps."""
+    name = f"{state['prefix']}-{i // 3}"
+    form = dict(info_url=f"https://www.{name}.com", deadline=DEADLINE)
+    if i % 3 == 0:
+        form["name"] = name
+        return client.request(
+            "POST", f"{API}/widgets", data=form, headers=state["headers"]
+        )[0]
+    if i % 3 == 1:
+        return client.request(
+            "PUT", f"{API}/widgets/{name}", data=form, headers=state["headers"]
+        )[0]
+    return client.request("DELETE", f"{API}/widgets/{name}", headers=state["headers"])[0]
+
+
+def per_page_choices():
+    """Values accepted by the per_page query string argument of GET /widgets."""
+    return pagination_reqparser.args[
+        [arg.name for arg in pagination_reqparser.args].index("per_page")
+    ].choices
+
+
+SCENARIOS = [
+    Scenario("login_storm", setup_login_storm, step_login_storm),
+    Scenario("auth_user", setup_user_login, step_auth_user),
+    *(
+        Scenario(f"widget_list_{per_page}", setup_user_login, widget_list_step(per_page))
+        for per_page in per_page_choices()
+    ),
+    Scenario("admin_writes", setup_admin_login, step_admin_writes),
+]
@@ -0,0 +1,103 @@
+"""store token digest in token_blacklist
+
+Revision ID: 3d9fd563c35c
+Revises: 7c66df0e878f
+Create Date: 2026-10-18 16:02:11.348107
+
+"""
+import hashlib
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "3d9fd563c35c"
+down_revision = "7c66df0e878f"
+branch_labels = None
+depends_on = None
+
+naming_convention = {"uq": "uq_%(table_name)s_%(column_0_name)s"}
+
+token_blacklist = sa.table(
+    "token_blacklist",
+    sa.column("id", sa.Integer),
+    sa.column("token", sa.String),
+    sa.column("token_digest", sa.String),
+    sa.column("expires_at", sa.DateTime),
+)
+
+
+class DigestOnlyTokens(Exception):
+    """Raised when unexpired tokens stored only as a digest block the downgrade."""
+
+
+def token_unique_constraint():
+    inspector = sa.inspect(op.get_bind())
+    for constraint in inspector.get_unique_constraints("token_blacklist"):
+        if constraint["column_names"] == ["token"]:
+            # SQLite reflects the constraint without a name, batch mode gives it the
+            # name from naming_convention when the table is copied.
+            return constraint["name"] or "uq_token_blacklist_token"
+    return None
+
+
+def upgrade():
+    op.add_column(
+        "token_blacklist", sa.Column("token_digest", sa.String(length=64), nullable=True)
+    )
+    connection = op.get_bind()
+    rows = connection.execute(sa.select([token_blacklist.c.id, token_blacklist.c.token]))
+    for row_id, token in rows.fetchall():
+        connection.execute(
+            token_blacklist.update()
+            .where(token_blacklist.c.id == row_id)
+            .values(token_digest=hashlib.sha256(token.encode("utf-8")).hexdigest())
+        )
+    token_constraint = token_unique_constraint()
+    with op.batch_alter_table(
+        "token_blacklist", naming_convention=naming_convention
+    ) as batch_op:
+        if token_constraint:
+            batch_op.drop_constraint(token_constraint, type_="unique")
+        batch_op.alter_column(
+            "token", existing_type=sa.String(length=500), nullable=True
+        )
+        batch_op.alter_column(
+            "token_digest", existing_type=sa.String(length=64), nullable=False
+        )
+        batch_op.create_index(
+            "ix_token_blacklist_token_digest", ["token_digest"], unique=True
+        )
+
+
+def downgrade():
+    # Tokens revoked after the upgrade are stored only as a digest and cannot be
+    # restored. Deleting them would make unexpired tokens valid again, so the
+    # downgrade is refused until they have expired. Expired ones are deleted.
+    connection = op.get_bind()
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    digest_only = token_blacklist.c.token.is_(None)
+    unexpired = connection.execute(
+        sa.select([sa.func.count()])
+        .select_from(token_blacklist)
+        .where(digest_only)
+        .where(token_blacklist.c.expires_at > now)
+    ).scalar()
+    if unexpired:
+        raise DigestOnlyTokens(
+            f"Cannot downgrade, {unexpired} unexpired revoked tokens are stored only "
+            "as a digest and would become valid again. Run the downgrade after the "
+            "last of them has expired."
+        )
+    connection.execute(token_blacklist.delete().where(digest_only))
+    with op.batch_alter_table(
+        "token_blacklist", naming_convention=naming_convention
+    ) as batch_op:
+        batch_op.drop_index("ix_token_blacklist_token_digest")
+        batch_op.alter_column(
+            "token", existing_type=sa.String(length=500), nullable=False
+        )
+        batch_op.create_unique_constraint("uq_token_blacklist_token", ["token"])
+        batch_op.drop_column("token_digest")
@@ -0,0 +1,31 @@
+"""add version and updated_at columns to widget
+
+Revision ID: 5e2a9c81f4d3
+Revises: 9b1e4c7d2a6f
+Create Date: 2026-10-18 20:12:37.901455
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "5e2a9c81f4d3"
+down_revision = "9b1e4c7d2a6f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("widget") as batch_op:
+        batch_op.add_column(
+            sa.Column("version", sa.Integer(), server_default="1", nullable=False)
+        )
+        batch_op.add_column(sa.Column("updated_at", sa.DateTime(), nullable=True))
+    op.execute("UPDATE widget SET updated_at = created_at")
+
+
+def downgrade():
+    with op.batch_alter_table("widget") as batch_op:
+        batch_op.drop_column("updated_at")
+        batch_op.drop_column("version")
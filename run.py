@@ -7,6 +7,7 @@ from flask_api_tutorial import create_app, db
 from flask_api_tutorial.models.token_blacklist import BlacklistedToken
 from flask_api_tutorial.models.user import User
 from flask_api_tutorial.models.widget import Widget
+from flask_api_tutorial.util.password_hasher import calibrate_rounds
 
 app = create_app(os.getenv("FLASK_ENV", "development"))
 
@@ -40,3 +41,45 @@ def add_user(email, admin, password):
     message = f"Successfully added new {user_type}:\n {new_user}"
     click.secho(message, fg="blue", bold=True)
     return 0
+
+
+@app.cli.command("purge-tokens", short_help="Delete expired blacklisted tokens")
+@click.option(
+    "--batch-size",
+    type=int,
+    default=None,
+    help="Rows deleted per transaction (default: TOKEN_PURGE_BATCH_SIZE)",
+)
+def purge_tokens(batch_size):
+    """Delete all blacklisted tokens that have already expired."""
+    batch_size = batch_size or app.config.get("TOKEN_PURGE_BATCH_SIZE")
+    result = BlacklistedToken.purge_expired(batch_size)
+    message = (
+        f"Purged {result.rows_purged} expired tokens in {result.batches} batches "
+        f"({result.elapsed_seconds:.3f}s)"
+    )
+    click.secho(message, fg="blue", bold=True)
+    return 0
+
+
+@app.cli.command("calibrate-bcrypt", short_help="Find BCRYPT_LOG_ROUNDS for a target")
+@click.option(
+    "--target-ms",
+    type=float,
+    default=250,
+    show_default=True,
+    help="Maximum time to verify a password, in milliseconds",
+)
+@click.option("--max-rounds", type=int, default=16, show_default=True)
+def calibrate_bcrypt(target_ms, max_rounds):
+    """Measure bcrypt verify time on this machine for increasing cost factors."""
+    rounds, timings = calibrate_rounds(target_ms, max_rounds=max_rounds)
+    for log_rounds, elapsed_ms in timings.items():
+        click.echo(f"  {log_rounds:2d} rounds: {elapsed_ms:9.2f} ms")
+    current = app.config.get("BCRYPT_LOG_ROUNDS")
+    message = (
+        f"Recommended: BCRYPT_LOG_ROUNDS={rounds} (current value: {current}). "
+        "Existing hashes are upgraded the next time each user logs in."
+    )
+    click.secho(message, fg="blue", bold=True)
+    return 0
@@ -16,8 +16,8 @@ PROJECT_URLS = {
     "Source Code": "https://github.com/a-luna/flask-api-tutorial",
 }
 INSTALL_REQUIRES = [
+    "bcrypt",
     "Flask",
-    "Flask-Bcrypt",
     "Flask-Cors",
     "Flask-Migrate",
     "flask-restx",
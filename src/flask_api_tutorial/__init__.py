@@ -1,16 +1,29 @@
 """Flask app initialization via factory pattern."""
 from flask import Flask
-from flask_bcrypt import Bcrypt
 from flask_cors import CORS
 from flask_migrate import Migrate
-from flask_sqlalchemy import SQLAlchemy
 
 from flask_api_tutorial.config import get_config
+from flask_api_tutorial.util.datetime_util import RequestClock
+from flask_api_tutorial.util.engine_profile import SQLAlchemy
+from flask_api_tutorial.util.password_hasher import PasswordHasher
+from flask_api_tutorial.util.periodic_task import PeriodicTask
+from flask_api_tutorial.util.read_replica import ReadReplicaRouter
+from flask_api_tutorial.util.response_cache import ResponseCache
 
 cors = CORS()
 db = SQLAlchemy()
 migrate = Migrate()
-bcrypt = Bcrypt()
+password_hasher = PasswordHasher()
+request_clock = RequestClock()
+response_cache = ResponseCache()
+read_replicas = ReadReplicaRouter()
+replica_sync_task = PeriodicTask(
+    read_replicas.sync_sqlite_replicas, "READ_REPLICA_SYNC_INTERVAL_SECONDS"
+)
+hash_pool_stats_task = PeriodicTask(
+    password_hasher.log_stats, "PASSWORD_HASH_STATS_LOG_INTERVAL_SECONDS"
+)
 
 
 def create_app(config_name):
@@ -18,11 +31,29 @@ def create_app(config_name):
     app.config.from_object(get_config(config_name))
 
     from flask_api_tutorial.api import api_bp
+    from flask_api_tutorial.models.token_blacklist import (
+        revocation_cache,
+        revocation_cache_stats_task,
+        token_purge_task,
+    )
+    from flask_api_tutorial.models.user import access_token_cache, user_cache
+    from flask_api_tutorial.models.widget import widget_count_cache
 
     app.register_blueprint(api_bp)
 
     cors.init_app(app)
     db.init_app(app)
+    read_replicas.init_app(app, db)
     migrate.init_app(app, db)
-    bcrypt.init_app(app)
+    password_hasher.init_app(app)
+    hash_pool_stats_task.init_app(app)
+    request_clock.init_app(app)
+    revocation_cache.init_app(app)
+    revocation_cache_stats_task.init_app(app)
+    token_purge_task.init_app(app)
+    access_token_cache.init_app(app)
+    user_cache.init_app(app)
+    widget_count_cache.init_app(app)
+    response_cache.init_app(app)
+    replica_sync_task.init_app(app)
     return app
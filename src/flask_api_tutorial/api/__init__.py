@@ -1,9 +1,12 @@
 """API blueprint configuration."""
+from http import HTTPStatus
+
 from flask import Blueprint
 from flask_restx import Api
 
 from flask_api_tutorial.api.auth.endpoints import auth_ns
 from flask_api_tutorial.api.widgets.endpoints import widget_ns
+from flask_api_tutorial.util.password_hasher import PasswordHashPoolFull
 
 api_bp = Blueprint("api", __name__, url_prefix="/api/v1")
 authorizations = {"Bearer": {"type": "apiKey", "in": "header", "name": "Authorization"}}
@@ -19,3 +22,11 @@ api = Api(
 
 api.add_namespace(auth_ns, path="/auth")
 api.add_namespace(widget_ns, path="/widgets")
+
+
+@api.errorhandler(PasswordHashPoolFull)
+def handle_password_hash_pool_full(error):
+    """Return 503 with a Retry-After header when the password hash pool is full."""
+    response_dict = dict(status="fail", message=str(error))
+    headers = {"Retry-After": str(error.retry_after)}
+    return response_dict, HTTPStatus.SERVICE_UNAVAILABLE, headers
@@ -4,14 +4,16 @@ from http import HTTPStatus
 from flask import current_app, jsonify
 from flask_restx import abort
 
-from flask_api_tutorial import db
+from flask_api_tutorial import db, read_replicas
+from flask_api_tutorial.api.auth.context import get_current_user, get_token_payload
 from flask_api_tutorial.api.auth.decorators import token_required
-from flask_api_tutorial.models.token_blacklist import BlacklistedToken
+from flask_api_tutorial.models.token_blacklist import BlacklistedToken, revocation_cache
 from flask_api_tutorial.models.user import User
 from flask_api_tutorial.util.datetime_util import (
     remaining_fromtimestamp,
     format_timespan_digits,
 )
+from flask_api_tutorial.util.password_hasher import PasswordHashPoolFull
 
 
 def process_registration_request(email, password):
@@ -28,10 +30,17 @@ def process_registration_request(email, password):
     )
 
 
+@read_replicas.read_only
 def process_login_request(email, password):
     user = User.find_by_email(email)
     if not user or not user.check_password(password):
         abort(HTTPStatus.UNAUTHORIZED, "email or password does not match", status="fail")
+    if user.password_needs_rehash():
+        try:
+            user.password = password
+            db.session.commit()
+        except PasswordHashPoolFull:
+            current_app.logger.info(f"Hash pool full, skipped rehash for {email}")
     access_token = user.encode_access_token()
     return _create_auth_successful_response(
         token=access_token.decode(),
@@ -40,22 +49,24 @@ def process_login_request(email, password):
     )
 
 
+@read_replicas.read_only
 @token_required
 def get_logged_in_user():
-    public_id = get_logged_in_user.public_id
-    user = User.find_by_public_id(public_id)
-    expires_at = get_logged_in_user.expires_at
+    user = get_current_user()
+    expires_at = get_token_payload()["expires_at"]
     user.token_expires_in = format_timespan_digits(remaining_fromtimestamp(expires_at))
     return user
 
 
 @token_required
 def process_logout_request():
-    access_token = process_logout_request.token
-    expires_at = process_logout_request.expires_at
+    token_payload = get_token_payload()
+    access_token = token_payload["token"]
+    expires_at = token_payload["expires_at"]
     blacklisted_token = BlacklistedToken(access_token, expires_at)
     db.session.add(blacklisted_token)
     db.session.commit()
+    revocation_cache.add(blacklisted_token.token_digest, expires_at)
     response_dict = dict(status="success", message="successfully logged out")
     return response_dict, HTTPStatus.OK
 
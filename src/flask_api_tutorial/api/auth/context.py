@@ -0,0 +1,23 @@
+"""Request-local context for the access token and user of the current request."""
+from flask import g
+
+from flask_api_tutorial.models.user import User
+
+
+def set_token_payload(token_payload):
+    """Store the verified access token payload for the current request."""
+    g.token_payload = token_payload
+    g.pop("current_user", None)
+
+
+def get_token_payload():
+    """Verified access token payload (public_id, admin, token and expires_at)."""
+    return g.get("token_payload")
+
+
+def get_current_user():
+    """User that sent the current request, loaded at most once per request."""
+    if "current_user" not in g:
+        public_id = (get_token_payload() or {}).get("public_id")
+        g.current_user = User.find_by_public_id_cached(public_id) if public_id else None
+    return g.current_user
@@ -3,6 +3,7 @@ from functools import wraps
 
 from flask import request
 
+from flask_api_tutorial.api.auth.context import set_token_payload
 from flask_api_tutorial.api.exceptions import ApiUnauthorized, ApiForbidden
 from flask_api_tutorial.models.user import User
 
@@ -13,8 +14,7 @@ def token_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
         token_payload = _check_access_token(admin_only=False)
-        for name, val in token_payload.items():
-            setattr(decorated, name, val)
+        set_token_payload(token_payload)
         return f(*args, **kwargs)
 
     return decorated
@@ -28,8 +28,7 @@ def admin_token_required(f):
         token_payload = _check_access_token(admin_only=True)
         if not token_payload["admin"]:
             raise ApiForbidden()
-        for name, val in token_payload.items():
-            setattr(decorated, name, val)
+        set_token_payload(token_payload)
         return f(*args, **kwargs)
 
     return decorated
@@ -24,6 +24,7 @@ class RegisterUser(Resource):
     @auth_ns.response(int(HTTPStatus.CONFLICT), "Email address is already registered.")
     @auth_ns.response(int(HTTPStatus.BAD_REQUEST), "Validation error.")
     @auth_ns.response(int(HTTPStatus.INTERNAL_SERVER_ERROR), "Internal server error.")
+    @auth_ns.response(int(HTTPStatus.SERVICE_UNAVAILABLE), "Server busy, retry later.")
     def post(self):
         """Register a new user and return an access token."""
         request_data = auth_reqparser.parse_args()
@@ -41,6 +42,7 @@ class LoginUser(Resource):
     @auth_ns.response(int(HTTPStatus.UNAUTHORIZED), "email or password does not match")
     @auth_ns.response(int(HTTPStatus.BAD_REQUEST), "Validation error.")
     @auth_ns.response(int(HTTPStatus.INTERNAL_SERVER_ERROR), "Internal server error.")
+    @auth_ns.response(int(HTTPStatus.SERVICE_UNAVAILABLE), "Server busy, retry later.")
     def post(self):
         """Authenticate an existing user and return an access token."""
         request_data = auth_reqparser.parse_args()
@@ -1,14 +1,51 @@
 """Business logic for /widgets API endpoints."""
+import csv
+import hashlib
+import io
+import json
+from datetime import timezone
 from http import HTTPStatus
+from itertools import islice
 
-from flask import jsonify, url_for
-from flask_restx import abort, marshal
+from flask import (
+    Response,
+    current_app,
+    jsonify,
+    request,
+    stream_with_context,
+    url_for,
+)
+from flask_restx import abort
+from sqlalchemy import bindparam, func
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.exc import StaleDataError
+from werkzeug.http import parse_date, unquote_etag
 
-from flask_api_tutorial import db
+from flask_api_tutorial import db, read_replicas, response_cache
+from flask_api_tutorial.api.auth.context import get_current_user
 from flask_api_tutorial.api.auth.decorators import token_required, admin_token_required
-from flask_api_tutorial.api.widgets.dto import pagination_model, widget_name
+from flask_api_tutorial.api.widgets.dto import (
+    parse_widget_operation,
+    serialize_pagination,
+    serialize_widget,
+    widget_name,
+)
 from flask_api_tutorial.models.user import User
-from flask_api_tutorial.models.widget import Widget
+from flask_api_tutorial.models.widget import Widget, widget_count_cache
+from flask_api_tutorial.util.datetime_util import clock_snapshot
+from flask_api_tutorial.util.keyset_pagination import KeysetPagination
+from flask_api_tutorial.util.pagination import OffsetPagination
+
+
+EXPORT_COLUMNS = ["id", "name", "info_url", "created_at", "deadline", "owner_email"]
+IN_CLAUSE_CHUNK_SIZE = 500
+WIDGET_FILTERS = [
+    "owner",
+    "deadline_after",
+    "deadline_before",
+    "deadline_passed",
+    "name_prefix",
+]
 
 
 @admin_token_required
@@ -18,81 +55,410 @@ def create_widget(widget_dict):
         error = f"Widget name: {name} already exists, must be unique."
         abort(HTTPStatus.CONFLICT, error, status="fail")
     widget = Widget(**widget_dict)
-    owner = User.find_by_public_id(create_widget.public_id)
-    widget.owner_id = owner.id
+    widget.owner_id = get_current_user().id
     db.session.add(widget)
     db.session.commit()
-    response = jsonify(status="success", message=f"New widget added: {name}.")
-    response.status_code = HTTPStatus.CREATED
-    response.headers["Location"] = url_for("api.widget", name=name)
-    return response
+    _invalidate_widget_caches()
+    return _widget_created_response(name)
 
 
+@read_replicas.read_only
 @token_required
-def retrieve_widget_list(page, per_page):
-    pagination = Widget.query.paginate(page, per_page, error_out=False)
-    response_data = marshal(pagination, pagination_model)
+def retrieve_widget_list(
+    page,
+    per_page,
+    count_mode="exact",
+    after=None,
+    before=None,
+    sort="created_at",
+    filters=None,
+):
+    cached_response = _cached_response()
+    if cached_response:
+        return cached_response
+    filters = {k: v for k, v in (filters or {}).items() if v is not None}
+    query = Widget.search(**filters).options(joinedload(Widget.owner))
+    descending = sort.startswith("-")
+    sort_order = Widget.list_order(sort.lstrip("-"))
+    if after is not None or before is not None:
+        pagination = KeysetPagination(
+            query,
+            sort_order,
+            per_page,
+            after=after,
+            before=before,
+            descending=descending,
+        )
+    else:
+        total, count_mode = Widget.total_count(count_mode, filters)
+        order = [column.desc() if descending else column for column in sort_order]
+        query = query.order_by(*order)
+        pagination = OffsetPagination(query, page, per_page, total, count_mode)
+    etag = _pagination_etag(pagination)
+    not_modified = _not_modified_response(etag, None)
+    if not_modified:
+        return not_modified
+    response_data = serialize_pagination(pagination)
     response_data["links"] = _pagination_nav_links(pagination)
     response = jsonify(response_data)
     response.headers["Link"] = _pagination_nav_header_links(pagination)
-    response.headers["Total-Count"] = pagination.total
+    if pagination.total is not None:
+        response.headers["Total-Count"] = pagination.total
+    _set_validators(response, etag, None)
+    _cache_response(response, pagination.items)
     return response
 
 
+@token_required
+def export_widgets(export_format, since=None):
+    query = db.session.query(
+        Widget.id,
+        Widget.name,
+        Widget.info_url,
+        Widget.created_at,
+        Widget.deadline,
+        User.email.label("owner_email"),
+    ).join(Widget.owner)
+    if since:
+        query = query.filter(Widget.created_at >= since)
+    query = query.order_by(*Widget.list_order())
+    batch_size = current_app.config.get("WIDGET_EXPORT_BATCH_SIZE")
+    rows = query.yield_per(batch_size)
+    if export_format == "csv":
+        chunks, mimetype = _csv_chunks(rows, batch_size), "text/csv"
+    else:
+        chunks, mimetype = _ndjson_chunks(rows, batch_size), "application/x-ndjson"
+    response = Response(stream_with_context(chunks), mimetype=mimetype)
+    response.headers[
+        "Content-Disposition"
+    ] = f"attachment; filename=widgets.{export_format}"
+    return response
+
+
+@read_replicas.read_only
 @token_required
 def retrieve_widget(name):
-    return Widget.query.filter_by(name=name.lower()).first_or_404(
+    cached_response = _cached_response()
+    if cached_response:
+        return cached_response
+    query = Widget.query.options(joinedload(Widget.owner))
+    widget = query.filter(Widget.name_matches(name)).first_or_404(
         description=f"{name} not found in database."
     )
+    not_modified = _not_modified_response(widget.etag, widget.last_modified)
+    if not_modified:
+        return not_modified
+    response = jsonify(serialize_widget(widget))
+    _set_validators(response, widget.etag, widget.last_modified)
+    _cache_response(response, [widget])
+    return response
 
 
 @admin_token_required
 def update_widget(name, widget_dict):
-    widget = Widget.find_by_name(name.lower())
-    if widget:
-        for k, v in widget_dict.items():
-            setattr(widget, k, v)
-        db.session.commit()
-        message = f"'{name}' was successfully updated"
-        response_dict = dict(status="success", message=message)
-        return response_dict, HTTPStatus.OK
     try:
         valid_name = widget_name(name.lower())
     except ValueError as e:
         abort(HTTPStatus.BAD_REQUEST, str(e), status="fail")
+    if not request.if_match:
+        owner_id = get_current_user().id
+        upserted = Widget.upsert(valid_name, owner_id=owner_id, **widget_dict)
+        if upserted:
+            db.session.commit()
+            _invalidate_widget_caches()
+            widget_id, version = upserted
+            etag = f"{widget_id}.{version}"
+            if version == 1:
+                return _widget_created_response(valid_name, etag)
+            return _widget_updated_response(name, etag)
+    widget = Widget.find_by_name(name)
+    if request.if_match and not (widget and request.if_match.contains(widget.etag)):
+        error = f"'{name}' does not match any of the ETags in the If-Match header."
+        abort(HTTPStatus.PRECONDITION_FAILED, error, status="fail")
+    if widget:
+        for k, v in widget_dict.items():
+            setattr(widget, k, v)
+        try:
+            db.session.commit()
+        except StaleDataError:
+            db.session.rollback()
+            error = f"'{name}' was modified by another request, please try again."
+            abort(HTTPStatus.PRECONDITION_FAILED, error, status="fail")
+        _invalidate_widget_caches()
+        return _widget_updated_response(name, widget.etag)
     widget_dict["name"] = valid_name
     return create_widget(widget_dict)
 
 
 @admin_token_required
 def delete_widget(name):
-    widget = Widget.query.filter_by(name=name.lower()).first_or_404(
+    widget = Widget.query.filter(Widget.name_matches(name)).first_or_404(
         description=f"{name} not found in database."
     )
     db.session.delete(widget)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except StaleDataError:
+        db.session.rollback()
+        error = f"'{name}' was modified by another request, please try again."
+        abort(HTTPStatus.PRECONDITION_FAILED, error, status="fail")
+    _invalidate_widget_caches()
     return "", HTTPStatus.NO_CONTENT
 
 
+@admin_token_required
+def process_widget_batch(operations):
+    if not isinstance(operations, list) or not operations:
+        error = "Request body must contain a non-empty list of operations."
+        abort(HTTPStatus.BAD_REQUEST, error, status="fail")
+    max_operations = current_app.config.get("WIDGET_BATCH_MAX_OPERATIONS")
+    if len(operations) > max_operations:
+        error = f"Batch contains {len(operations)} operations, the limit is {max_operations}."
+        abort(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, error, status="fail")
+    results, valid_operations = _validate_widget_operations(operations)
+    widget_ids = _find_widget_ids([parsed["name"] for _, parsed in valid_operations])
+    inserts, updates, delete_ids = [], [], []
+    owner_id = get_current_user().id
+    for result, parsed in valid_operations:
+        name = parsed["name"]
+        widget_id = widget_ids.get(name.lower())
+        if parsed["op"] == "create" and widget_id:
+            message = f"Widget name: {name} already exists, must be unique."
+            result.update(status="failed", message=message)
+        elif parsed["op"] != "create" and not widget_id:
+            result.update(status="failed", message=f"{name} not found in database.")
+        elif parsed["op"] == "create":
+            parsed.pop("op")
+            inserts.append(dict(parsed, owner_id=owner_id))
+            result.update(status="created", message=f"New widget added: {name}.")
+        elif parsed["op"] == "update":
+            updates.append(
+                dict(
+                    widget_id=widget_id,
+                    new_info_url=parsed["info_url"],
+                    new_deadline=parsed["deadline"],
+                )
+            )
+            message = f"'{name}' was successfully updated"
+            result.update(status="updated", message=message)
+        else:
+            delete_ids.append(widget_id)
+            result.update(status="deleted", message=f"'{name}' was deleted")
+
+    if inserts:
+        db.session.execute(Widget.__table__.insert(), inserts)
+    if updates:
+        db.session.execute(_batch_update_statement(), updates)
+    for chunk in _chunks(delete_ids, IN_CLAUSE_CHUNK_SIZE):
+        db.session.execute(Widget.__table__.delete().where(Widget.id.in_(chunk)))
+    db.session.commit()
+    if inserts or updates or delete_ids:
+        _invalidate_widget_caches()
+
+    failed = sum(1 for result in results if result["status"] == "failed")
+    succeeded = len(results) - failed
+    status = "success" if not failed else "fail" if not succeeded else "partial"
+    return jsonify(status=status, succeeded=succeeded, failed=failed, results=results)
+
+
+def _validate_widget_operations(operations):
+    results, valid_operations, seen_names = [], [], set()
+    for index, operation in enumerate(operations):
+        parsed, errors = parse_widget_operation(operation)
+        name = operation.get("name") if isinstance(operation, dict) else None
+        result = dict(index=index, op=parsed.get("op"), name=name)
+        results.append(result)
+        if not errors and name.lower() in seen_names:
+            errors = {"name": f"Batch contains more than one operation for {name}."}
+        if errors:
+            result.update(status="failed", errors=errors)
+            continue
+        seen_names.add(name.lower())
+        valid_operations.append((result, parsed))
+    return results, valid_operations
+
+
+def _batch_update_statement():
+    widget = Widget.__table__
+    return (
+        widget.update()
+        .where(widget.c.id == bindparam("widget_id"))
+        .values(
+            info_url=bindparam("new_info_url"),
+            deadline=bindparam("new_deadline"),
+            version=widget.c.version + 1,
+        )
+    )
+
+
+def _find_widget_ids(names):
+    widget_ids = {}
+    lower_name = func.lower(Widget.name)
+    for chunk in _chunks(sorted({name.lower() for name in names}), IN_CLAUSE_CHUNK_SIZE):
+        query = db.session.query(lower_name, Widget.id).filter(lower_name.in_(chunk))
+        widget_ids.update(query.all())
+    return widget_ids
+
+
+def _chunks(values, size):
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+def _ndjson_chunks(rows, batch_size):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield "".join(
+            json.dumps(_export_row_dict(row), separators=(",", ":")) + "\n"
+            for row in batch
+        )
+
+
+def _csv_chunks(rows, batch_size):
+    rows = iter(rows)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    while True:
+        batch = list(islice(rows, batch_size))
+        writer.writerows(_export_row_dict(row).values() for row in batch)
+        yield buffer.getvalue()
+        if not batch:
+            return
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def _export_row_dict(row):
+    return dict(
+        id=row.id,
+        name=row.name,
+        info_url=row.info_url,
+        created_at=row.created_at.isoformat() if row.created_at else None,
+        deadline=row.deadline.isoformat() if row.deadline else None,
+        owner_email=row.owner_email,
+    )
+
+
+def _widget_created_response(name, etag=None):
+    response = jsonify(status="success", message=f"New widget added: {name}.")
+    response.status_code = HTTPStatus.CREATED
+    response.headers["Location"] = url_for("api.widget", name=name)
+    if etag:
+        response.set_etag(etag)
+    return response
+
+
+def _widget_updated_response(name, etag):
+    response_dict = dict(status="success", message=f"'{name}' was successfully updated")
+    return response_dict, HTTPStatus.OK, {"ETag": f'"{etag}"'}
+
+
+def _invalidate_widget_caches():
+    widget_count_cache.invalidate()
+    response_cache.invalidate()
+
+
+def _cached_response():
+    entry = response_cache.get(request.full_path)
+    if not entry:
+        return None
+    headers = entry["headers"]
+    etag, _ = unquote_etag(headers["ETag"])
+    last_modified = parse_date(headers.get("Last-Modified"))
+    not_modified = _not_modified_response(etag, last_modified)
+    if not_modified:
+        return not_modified
+    return Response(entry["body"], mimetype="application/json", headers=headers)
+
+
+def _cache_response(response, widgets):
+    now = clock_snapshot().timestamp()
+    deadlines = [
+        widget.deadline.replace(tzinfo=timezone.utc).timestamp() for widget in widgets
+    ]
+    next_deadline = min((d for d in deadlines if d > now), default=None)
+    headers = {
+        name: value
+        for name, value in response.headers.items()
+        if name not in ("Content-Type", "Content-Length")
+    }
+    body = response.get_data(as_text=True)
+    response_cache.set(request.full_path, body, headers, expires_at=next_deadline)
+
+
+def _pagination_etag(pagination):
+    # No Last-Modified: deleting a widget removes it from the page without moving
+    # max(updated_at) forward, so If-Modified-Since would return a stale 304.
+    fingerprint = [pagination.total, pagination.has_prev, pagination.has_next]
+    fingerprint.extend(widget.etag for widget in pagination.items)
+    return hashlib.sha1(json.dumps(fingerprint).encode()).hexdigest()
+
+
+def _not_modified_response(etag, last_modified):
+    if request.if_none_match:
+        is_modified = not request.if_none_match.contains_weak(etag)
+    elif request.if_modified_since and last_modified:
+        is_modified = last_modified.replace(microsecond=0) > request.if_modified_since
+    else:
+        return None
+    if is_modified:
+        return None
+    response = Response(status=HTTPStatus.NOT_MODIFIED)
+    return _set_validators(response, etag, last_modified)
+
+
+def _set_validators(response, etag, last_modified):
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    return response
+
+
 def _pagination_nav_links(pagination):
+    if isinstance(pagination, KeysetPagination):
+        return _keyset_nav_links(pagination)
     nav_links = {}
     per_page = pagination.per_page
     this_page = pagination.page
     last_page = pagination.pages
-    nav_links["self"] = url_for("api.widget_list", page=this_page, per_page=per_page)
-    nav_links["first"] = url_for("api.widget_list", page=1, per_page=per_page)
+    nav_links["self"] = _widget_list_url(page=this_page, per_page=per_page)
+    nav_links["first"] = _widget_list_url(page=1, per_page=per_page)
     if pagination.has_prev:
-        nav_links["prev"] = url_for(
-            "api.widget_list", page=this_page - 1, per_page=per_page
+        nav_links["prev"] = _widget_list_url(page=this_page - 1, per_page=per_page)
+    if pagination.has_next:
+        nav_links["next"] = _widget_list_url(page=this_page + 1, per_page=per_page)
+    if last_page is not None:
+        nav_links["last"] = _widget_list_url(page=last_page, per_page=per_page)
+    return nav_links
+
+
+def _keyset_nav_links(pagination):
+    nav_links = {}
+    per_page = pagination.per_page
+    nav_links["self"] = _widget_list_url(per_page=per_page, **pagination.cursor_args)
+    nav_links["first"] = _widget_list_url(after="", per_page=per_page)
+    if pagination.has_prev:
+        nav_links["prev"] = _widget_list_url(
+            before=pagination.prev_cursor, per_page=per_page
         )
     if pagination.has_next:
-        nav_links["next"] = url_for(
-            "api.widget_list", page=this_page + 1, per_page=per_page
+        nav_links["next"] = _widget_list_url(
+            after=pagination.next_cursor, per_page=per_page
         )
-    nav_links["last"] = url_for("api.widget_list", page=last_page, per_page=per_page)
+    nav_links["last"] = _widget_list_url(before="", per_page=per_page)
     return nav_links
 
 
+def _widget_list_url(**kwargs):
+    list_args = WIDGET_FILTERS + ["sort", "count"]
+    url_args = {k: v for k, v in request.args.items() if k in list_args}
+    return url_for("api.widget_list", **url_args, **kwargs)
+
+
 def _pagination_nav_header_links(pagination):
     url_dict = _pagination_nav_links(pagination)
     link_header = ""
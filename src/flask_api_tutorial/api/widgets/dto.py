@@ -4,11 +4,25 @@ from datetime import date, datetime, time, timezone
 
 from dateutil import parser
 from flask_restx import Model
-from flask_restx.fields import Boolean, DateTime, Integer, List, Nested, String, Url
-from flask_restx.inputs import positive, URL
+from flask_restx.fields import (
+    Boolean,
+    DateTime,
+    Integer,
+    List,
+    Nested,
+    Raw,
+    String,
+    Url,
+)
+from flask_restx.inputs import boolean, positive, URL
 from flask_restx.reqparse import RequestParser
 
 from flask_api_tutorial.util.datetime_util import make_tzaware, DATE_MONTH_NAME
+from flask_api_tutorial.util.keyset_pagination import decode_cursor
+from flask_api_tutorial.util.serializer import compile_model
+
+WIDGET_OPERATIONS = ["create", "update", "delete"]
+widget_url = URL(schemes=["http", "https"])
 
 
 def widget_name(name):
@@ -45,6 +59,64 @@ def future_date_from_string(date_str):
     return deadline_utc
 
 
+def utc_datetime_from_string(date_str):
+    """Validation method for an ISO 8601 timestamp, returned as naive UTC datetime."""
+    try:
+        parsed = parser.isoparse(date_str)
+    except ValueError:
+        raise ValueError(
+            f"Failed to parse '{date_str}' as an ISO 8601 timestamp, for example "
+            "'2020-05-13' or '2020-05-13T08:30:00+00:00'."
+        )
+    if parsed.tzinfo:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def widget_list_cursor(cursor):
+    """Validation method for an opaque cursor into the (created_at|deadline, id) order.
+
+    An empty string is valid and refers to the start (after) or end (before) of the
+    list.
+    """
+    values = decode_cursor(cursor)
+    if not values:
+        return ()
+    try:
+        created_at, widget_id = values
+        return (datetime.fromisoformat(created_at), int(widget_id))
+    except (TypeError, ValueError):
+        raise ValueError(f"'{cursor}' is not a valid pagination cursor.")
+
+
+def parse_widget_operation(operation):
+    """Validate one item of a widget batch request with the same rules as the forms.
+
+    Returns the operation with parsed values and a dict of error messages per field,
+    which is empty if the operation is valid.
+    """
+    if not isinstance(operation, dict):
+        return {}, {"operation": "Each operation must be a JSON object."}
+    op = operation.get("op")
+    parsed, errors = dict(op=op), {}
+    if op not in WIDGET_OPERATIONS:
+        errors["op"] = f"'{op}' is not a valid choice: {', '.join(WIDGET_OPERATIONS)}."
+    required = ["name"] if op == "delete" else ["name", "info_url", "deadline"]
+    validators = dict(
+        name=widget_name, info_url=widget_url, deadline=future_date_from_string
+    )
+    for field in required:
+        value = operation.get(field)
+        if not isinstance(value, str) or not value:
+            errors[field] = "Missing required parameter."
+            continue
+        try:
+            parsed[field] = validators[field](value)
+        except ValueError as e:
+            errors[field] = str(e)
+    return parsed, errors
+
+
 create_widget_reqparser = RequestParser(bundle_errors=True)
 create_widget_reqparser.add_argument(
     "name",
@@ -56,7 +128,7 @@ create_widget_reqparser.add_argument(
 )
 create_widget_reqparser.add_argument(
     "info_url",
-    type=URL(schemes=["http", "https"]),
+    type=widget_url,
     location="form",
     required=True,
     nullable=False,
@@ -77,6 +149,73 @@ pagination_reqparser.add_argument("page", type=positive, required=False, default
 pagination_reqparser.add_argument(
     "per_page", type=positive, required=False, choices=[5, 10, 25, 50, 100], default=10
 )
+pagination_reqparser.add_argument(
+    "count",
+    type=str,
+    required=False,
+    choices=["exact", "estimate", "none"],
+    default="exact",
+)
+pagination_reqparser.add_argument("owner", type=str, required=False)
+pagination_reqparser.add_argument(
+    "deadline_after", type=utc_datetime_from_string, required=False
+)
+pagination_reqparser.add_argument(
+    "deadline_before", type=utc_datetime_from_string, required=False
+)
+pagination_reqparser.add_argument("deadline_passed", type=boolean, required=False)
+pagination_reqparser.add_argument("name_prefix", type=widget_name, required=False)
+pagination_reqparser.add_argument(
+    "sort",
+    type=str,
+    required=False,
+    choices=["created_at", "-created_at", "deadline", "-deadline"],
+    default="created_at",
+)
+pagination_reqparser.add_argument("after", type=widget_list_cursor, required=False)
+pagination_reqparser.add_argument("before", type=widget_list_cursor, required=False)
+
+export_reqparser = RequestParser(bundle_errors=True)
+export_reqparser.add_argument(
+    "format", type=str, required=False, choices=["ndjson", "csv"], default="ndjson"
+)
+export_reqparser.add_argument("since", type=utc_datetime_from_string, required=False)
+
+widget_operation_model = Model(
+    "Widget Operation",
+    {
+        "op": String(enum=WIDGET_OPERATIONS, required=True),
+        "name": String(required=True),
+        "info_url": String,
+        "deadline": String,
+    },
+)
+
+widget_batch_model = Model(
+    "Widget Batch", {"operations": List(Nested(widget_operation_model), required=True)}
+)
+
+widget_operation_result_model = Model(
+    "Widget Operation Result",
+    {
+        "index": Integer,
+        "op": String,
+        "name": String,
+        "status": String(enum=["created", "updated", "deleted", "failed"]),
+        "message": String,
+        "errors": Raw,
+    },
+)
+
+widget_batch_result_model = Model(
+    "Widget Batch Result",
+    {
+        "status": String,
+        "succeeded": Integer,
+        "failed": Integer,
+        "results": List(Nested(widget_operation_result_model, skip_none=True)),
+    },
+)
 
 widget_owner_model = Model("Widget Owner", {"email": String, "public_id": String})
 
@@ -111,6 +250,10 @@ pagination_model = Model(
         "total_pages": Integer(attribute="pages"),
         "items_per_page": Integer(attribute="per_page"),
         "total_items": Integer(attribute="total"),
+        "count_mode": String,
         "items": List(Nested(widget_model)),
     },
 )
+
+serialize_widget = compile_model(widget_model)
+serialize_pagination = compile_model(pagination_model)
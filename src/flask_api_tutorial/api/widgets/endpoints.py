@@ -7,14 +7,22 @@ from flask_api_tutorial.api.widgets.dto import (
     create_widget_reqparser,
     update_widget_reqparser,
     pagination_reqparser,
+    export_reqparser,
+    widget_operation_model,
+    widget_batch_model,
+    widget_operation_result_model,
+    widget_batch_result_model,
     widget_owner_model,
     widget_model,
     pagination_links_model,
     pagination_model,
 )
 from flask_api_tutorial.api.widgets.business import (
+    WIDGET_FILTERS,
     create_widget,
     retrieve_widget_list,
+    export_widgets,
+    process_widget_batch,
     retrieve_widget,
     update_widget,
     delete_widget,
@@ -25,6 +33,10 @@ widget_ns.models[widget_owner_model.name] = widget_owner_model
 widget_ns.models[widget_model.name] = widget_model
 widget_ns.models[pagination_links_model.name] = pagination_links_model
 widget_ns.models[pagination_model.name] = pagination_model
+widget_ns.models[widget_operation_model.name] = widget_operation_model
+widget_ns.models[widget_batch_model.name] = widget_batch_model
+widget_ns.models[widget_operation_result_model.name] = widget_operation_result_model
+widget_ns.models[widget_batch_result_model.name] = widget_batch_result_model
 
 
 @widget_ns.route("", endpoint="widget_list")
@@ -36,13 +48,27 @@ class WidgetList(Resource):
 
     @widget_ns.doc(security="Bearer")
     @widget_ns.response(HTTPStatus.OK, "Retrieved widget list.", pagination_model)
+    @widget_ns.response(int(HTTPStatus.NOT_MODIFIED), "Widget list has not changed.")
     @widget_ns.expect(pagination_reqparser)
     def get(self):
         """Retrieve a list of widgets."""
         request_data = pagination_reqparser.parse_args()
         page = request_data.get("page")
         per_page = request_data.get("per_page")
-        return retrieve_widget_list(page, per_page)
+        count_mode = request_data.get("count")
+        after = request_data.get("after")
+        before = request_data.get("before")
+        sort = request_data.get("sort")
+        filters = {name: request_data.get(name) for name in WIDGET_FILTERS}
+        return retrieve_widget_list(
+            page,
+            per_page,
+            count_mode=count_mode,
+            after=after,
+            before=before,
+            sort=sort,
+            filters=filters,
+        )
 
     @widget_ns.doc(security="Bearer")
     @widget_ns.response(int(HTTPStatus.CREATED), "Added new widget.")
@@ -55,6 +81,46 @@ class WidgetList(Resource):
         return create_widget(widget_dict)
 
 
+@widget_ns.route("/export", endpoint="widget_export")
+@widget_ns.response(int(HTTPStatus.BAD_REQUEST), "Validation error.")
+@widget_ns.response(int(HTTPStatus.UNAUTHORIZED), "Unauthorized.")
+@widget_ns.response(int(HTTPStatus.INTERNAL_SERVER_ERROR), "Internal server error.")
+class WidgetExport(Resource):
+    """Handles HTTP requests to URL: /widgets/export."""
+
+    @widget_ns.doc(security="Bearer")
+    @widget_ns.response(int(HTTPStatus.OK), "Streamed all widgets as NDJSON or CSV.")
+    @widget_ns.produces(["application/x-ndjson", "text/csv"])
+    @widget_ns.expect(export_reqparser)
+    def get(self):
+        """Export all widgets created since a point in time."""
+        request_data = export_reqparser.parse_args()
+        export_format = request_data.get("format")
+        since = request_data.get("since")
+        return export_widgets(export_format, since=since)
+
+
+@widget_ns.route("/batch", endpoint="widget_batch")
+@widget_ns.response(int(HTTPStatus.BAD_REQUEST), "Validation error.")
+@widget_ns.response(int(HTTPStatus.UNAUTHORIZED), "Unauthorized.")
+@widget_ns.response(int(HTTPStatus.FORBIDDEN), "Administrator token required.")
+@widget_ns.response(int(HTTPStatus.REQUEST_ENTITY_TOO_LARGE), "Too many operations.")
+@widget_ns.response(int(HTTPStatus.INTERNAL_SERVER_ERROR), "Internal server error.")
+class WidgetBatch(Resource):
+    """Handles HTTP requests to URL: /widgets/batch."""
+
+    @widget_ns.doc(security="Bearer")
+    @widget_ns.response(
+        int(HTTPStatus.OK), "Processed widget operations.", widget_batch_result_model
+    )
+    @widget_ns.expect(widget_batch_model, validate=False)
+    def post(self):
+        """Create, update and delete many widgets in one transaction."""
+        payload = widget_ns.payload
+        operations = payload.get("operations") if isinstance(payload, dict) else None
+        return process_widget_batch(operations)
+
+
 @widget_ns.route("/<name>", endpoint="widget")
 @widget_ns.param("name", "Widget name")
 @widget_ns.response(int(HTTPStatus.BAD_REQUEST), "Validation error.")
@@ -66,7 +132,7 @@ class Widget(Resource):
 
     @widget_ns.doc(security="Bearer")
     @widget_ns.response(int(HTTPStatus.OK), "Retrieved widget.", widget_model)
-    @widget_ns.marshal_with(widget_model)
+    @widget_ns.response(int(HTTPStatus.NOT_MODIFIED), "Widget has not changed.")
     def get(self, name):
         """Retrieve a widget."""
         return retrieve_widget(name)
@@ -75,6 +141,7 @@ class Widget(Resource):
     @widget_ns.response(int(HTTPStatus.OK), "Widget was updated.", widget_model)
     @widget_ns.response(int(HTTPStatus.CREATED), "Added new widget.")
     @widget_ns.response(int(HTTPStatus.FORBIDDEN), "Administrator token required.")
+    @widget_ns.response(int(HTTPStatus.PRECONDITION_FAILED), "If-Match failed.")
     @widget_ns.expect(update_widget_reqparser)
     def put(self, name):
         """Update a widget."""
@@ -84,6 +151,7 @@ class Widget(Resource):
     @widget_ns.doc(security="Bearer")
     @widget_ns.response(int(HTTPStatus.NO_CONTENT), "Widget was deleted.")
     @widget_ns.response(int(HTTPStatus.FORBIDDEN), "Administrator token required.")
+    @widget_ns.response(int(HTTPStatus.PRECONDITION_FAILED), "Widget was modified.")
     def delete(self, name):
         """Delete a widget."""
         return delete_widget(name)
@@ -7,6 +7,32 @@ HERE = Path(__file__).parent
 SQLITE_DEV = "sqlite:///" + str(HERE / "flask_api_tutorial_dev.db")
 SQLITE_TEST = "sqlite:///" + str(HERE / "flask_api_tutorial_test.db")
 SQLITE_PROD = "sqlite:///" + str(HERE / "flask_api_tutorial_prod.db")
+RESPONSE_CACHE_DB = str(HERE / "flask_api_tutorial_cache.db")
+
+ENGINE_PROFILES = dict(
+    default=dict(
+        pool_size=5,
+        max_overflow=10,
+        pool_timeout=30,
+        pool_recycle=-1,
+        pool_pre_ping=False,
+        sqlite_pragmas=dict(journal_mode="WAL", synchronous="NORMAL", busy_timeout=5000),
+    ),
+    production=dict(
+        pool_size=10,
+        max_overflow=20,
+        pool_timeout=30,
+        pool_recycle=1800,
+        pool_pre_ping=True,
+        sqlite_pragmas=dict(
+            journal_mode="WAL",
+            synchronous="NORMAL",
+            busy_timeout=5000,
+            mmap_size=268435456,
+            cache_size=-65536,
+        ),
+    ),
+)
 
 
 class Config:
@@ -14,13 +40,48 @@ class Config:
 
     SECRET_KEY = os.getenv("SECRET_KEY", "open sesame")
     BCRYPT_LOG_ROUNDS = 4
+    PASSWORD_HASH_POOL = "thread"
+    PASSWORD_HASH_POOL_WORKERS = os.cpu_count() or 1
+    PASSWORD_HASH_POOL_QUEUE_SIZE = 32
+    PASSWORD_HASH_RETRY_AFTER = 1
+    PASSWORD_HASH_STATS_LOG_INTERVAL_SECONDS = int(
+        os.getenv("PASSWORD_HASH_STATS_LOG_INTERVAL_SECONDS", "0")
+    )
     TOKEN_EXPIRE_HOURS = 0
     TOKEN_EXPIRE_MINUTES = 0
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    DATABASE_ENGINE_PROFILE = os.getenv("DATABASE_ENGINE_PROFILE", "default")
+    READ_REPLICA_URL = os.getenv("READ_REPLICA_URL")
+    SQLALCHEMY_BINDS = dict(replica=READ_REPLICA_URL) if READ_REPLICA_URL else None
+    READ_REPLICA_BINDS = ("replica",) if READ_REPLICA_URL else ()
+    READ_REPLICA_PIN_SECONDS = 5
+    READ_REPLICA_SYNC_INTERVAL_SECONDS = 0
     PRESERVE_CONTEXT_ON_EXCEPTION = False
     SWAGGER_UI_DOC_EXPANSION = "list"
     RESTX_MASK_SWAGGER = False
     JSON_SORT_KEYS = False
+    ACCESS_TOKEN_CACHE_SIZE = 1024
+    USER_CACHE_SIZE = 1024
+    USER_CACHE_TTL_SECONDS = 60
+    WIDGET_COUNT_CACHE_SIZE = 64
+    WIDGET_COUNT_CACHE_TTL_SECONDS = 60
+    WIDGET_EXPORT_BATCH_SIZE = 1000
+    WIDGET_BATCH_MAX_OPERATIONS = 50000
+    RESPONSE_CACHE = os.getenv("RESPONSE_CACHE", "memory")
+    RESPONSE_CACHE_PATH = os.getenv("RESPONSE_CACHE_PATH", RESPONSE_CACHE_DB)
+    RESPONSE_CACHE_SIZE = 1024
+    RESPONSE_CACHE_TTL_SECONDS = 5
+    TOKEN_BLACKLIST_STORE_RAW_TOKEN = False
+    TOKEN_BLACKLIST_CACHE_SIZE = 10000
+    TOKEN_BLACKLIST_CACHE_SYNC_SECONDS = 5
+    TOKEN_BLACKLIST_CACHE_SYNC_OVERLAP_SECONDS = 60
+    TOKEN_BLACKLIST_BLOOM_FILTER_BYTES = 0
+    TOKEN_BLACKLIST_BLOOM_FILTER_HASHES = 7
+    TOKEN_BLACKLIST_CACHE_STATS_LOG_INTERVAL_SECONDS = int(
+        os.getenv("TOKEN_BLACKLIST_CACHE_STATS_LOG_INTERVAL_SECONDS", "0")
+    )
+    TOKEN_PURGE_BATCH_SIZE = 1000
+    TOKEN_PURGE_INTERVAL_SECONDS = 0
 
 
 class TestingConfig(Config):
@@ -41,8 +102,9 @@ class ProductionConfig(Config):
     """Production configuration."""
 
     TOKEN_EXPIRE_HOURS = 1
-    BCRYPT_LOG_ROUNDS = 13
+    BCRYPT_LOG_ROUNDS = int(os.getenv("BCRYPT_LOG_ROUNDS", "13"))
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", SQLITE_PROD)
+    DATABASE_ENGINE_PROFILE = os.getenv("DATABASE_ENGINE_PROFILE", "production")
     PRESERVE_CONTEXT_ON_EXCEPTION = True
 
 
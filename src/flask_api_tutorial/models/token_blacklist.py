@@ -1,8 +1,18 @@
 """Class definition for BlacklistedToken."""
+import hashlib
+import time
+from collections import namedtuple
 from datetime import timezone
 
-from flask_api_tutorial import db
+from flask import current_app
+from sqlalchemy import or_, select
+
+from flask_api_tutorial import db, read_replicas
 from flask_api_tutorial.util.datetime_util import utc_now, dtaware_fromtimestamp
+from flask_api_tutorial.util.periodic_task import PeriodicTask
+from flask_api_tutorial.util.revocation_cache import RevocationCache
+
+purge_result = namedtuple("purge_result", ["rows_purged", "batches", "elapsed_seconds"])
 
 
 class BlacklistedToken(db.Model):
@@ -11,18 +21,104 @@ class BlacklistedToken(db.Model):
     __tablename__ = "token_blacklist"
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    token = db.Column(db.String(500), unique=True, nullable=False)
+    token = db.Column(db.String(500), nullable=True)
+    token_digest = db.Column(db.String(64), index=True, unique=True, nullable=False)
     blacklisted_on = db.Column(db.DateTime, default=utc_now)
-    expires_at = db.Column(db.DateTime, nullable=False)
+    expires_at = db.Column(db.DateTime, index=True, nullable=False)
 
     def __init__(self, token, expires_at):
-        self.token = token
+        self.token_digest = self.digest(token)
+        if current_app.config.get("TOKEN_BLACKLIST_STORE_RAW_TOKEN"):
+            self.token = token
         self.expires_at = dtaware_fromtimestamp(expires_at, use_tz=timezone.utc)
 
     def __repr__(self):
-        return f"<BlacklistToken token={self.token}>"
+        return f"<BlacklistToken token_digest={self.token_digest}>"
+
+    @staticmethod
+    def digest(token):
+        if isinstance(token, bytes):
+            token = token.decode("ascii")
+        return hashlib.sha256(token.encode("ascii")).hexdigest()
 
     @classmethod
+    @read_replicas.read_only
     def check_blacklist(cls, token):
-        exists = cls.query.filter_by(token=token).first()
+        token_digest = cls.digest(token)
+        cached = revocation_cache.lookup(token_digest)
+        if cached is not None:
+            return cached
+        exists = cls.query.filter_by(token_digest=token_digest).first()
+        expires_at = _utc_timestamp(exists.expires_at) if exists else None
+        revocation_cache.record_lookup(token_digest, expires_at)
         return True if exists else False
+
+    @classmethod
+    @read_replicas.primary
+    def find_unexpired(cls, after_id=None, blacklisted_since=None):
+        query = cls.query.with_entities(cls.id, cls.token_digest, cls.expires_at).filter(
+            cls.expires_at > utc_now()
+        )
+        newer = []
+        if after_id is not None:
+            newer.append(cls.id > after_id)
+        if blacklisted_since is not None:
+            newer.append(cls.blacklisted_on >= blacklisted_since)
+        if newer:
+            query = query.filter(or_(*newer))
+        return [
+            (row_id, digest, _utc_timestamp(expires_at))
+            for row_id, digest, expires_at in query
+        ]
+
+    @classmethod
+    def purge_expired(cls, batch_size=1000):
+        start = time.perf_counter()
+        now = utc_now()
+        rows_purged = batches = 0
+        while True:
+            expired_ids = select(cls.id).where(cls.expires_at <= now).limit(batch_size)
+            deleted = cls.query.filter(cls.id.in_(expired_ids)).delete(
+                synchronize_session=False
+            )
+            db.session.commit()
+            if not deleted:
+                break
+            rows_purged += deleted
+            batches += 1
+            if deleted < batch_size:
+                break
+        return purge_result(rows_purged, batches, time.perf_counter() - start)
+
+
+def _utc_timestamp(dt_naive_utc):
+    return dt_naive_utc.replace(tzinfo=timezone.utc).timestamp()
+
+
+def purge_expired_tokens():
+    batch_size = current_app.config.get("TOKEN_PURGE_BATCH_SIZE")
+    result = BlacklistedToken.purge_expired(batch_size)
+    if result.rows_purged and revocation_cache.bloom_filter:
+        revocation_cache.rebuild()
+    current_app.logger.info(
+        f"Purged {result.rows_purged} expired tokens in {result.batches} batches "
+        f"({result.elapsed_seconds:.3f}s)"
+    )
+    return result
+
+
+def log_revocation_cache_stats():
+    stats = revocation_cache.stats()
+    current_app.logger.info(
+        f"Revocation cache: {stats['hits']} hits, {stats['misses']} misses, "
+        f"{stats['size']}/{stats['max_size']} tokens, {stats['evictions']} evictions, "
+        f"authoritative={stats['authoritative']}"
+    )
+    return stats
+
+
+revocation_cache = RevocationCache(loader=BlacklistedToken.find_unexpired)
+token_purge_task = PeriodicTask(purge_expired_tokens, "TOKEN_PURGE_INTERVAL_SECONDS")
+revocation_cache_stats_task = PeriodicTask(
+    log_revocation_cache_stats, "TOKEN_BLACKLIST_CACHE_STATS_LOG_INTERVAL_SECONDS"
+)
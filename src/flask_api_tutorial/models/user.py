@@ -1,13 +1,18 @@
 """Class definition for User model."""
+import time
 from datetime import datetime, timezone, timedelta
 from uuid import uuid4
 
 import jwt
 from flask import current_app
+from sqlalchemy import event, inspect
 from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import make_transient_to_detached
 
-from flask_api_tutorial import db, bcrypt
+from flask_api_tutorial import db, password_hasher
 from flask_api_tutorial.models.token_blacklist import BlacklistedToken
+from flask_api_tutorial.util.cache import LRUCache
+from flask_api_tutorial.util.password_hasher import get_hash_rounds
 from flask_api_tutorial.util.datetime_util import (
     utc_now,
     get_local_utcoffset,
@@ -48,11 +53,14 @@ class User(db.Model):
     @password.setter
     def password(self, password):
         log_rounds = current_app.config.get("BCRYPT_LOG_ROUNDS")
-        hash_bytes = bcrypt.generate_password_hash(password, log_rounds)
-        self.password_hash = hash_bytes.decode("utf-8")
+        self.password_hash = password_hasher.generate_password_hash(password, log_rounds)
 
     def check_password(self, password):
-        return bcrypt.check_password_hash(self.password_hash, password)
+        return password_hasher.check_password_hash(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        log_rounds = current_app.config.get("BCRYPT_LOG_ROUNDS")
+        return get_hash_rounds(self.password_hash) != log_rounds
 
     def encode_access_token(self):
         now = datetime.now(timezone.utc)
@@ -69,6 +77,28 @@ class User(db.Model):
     def decode_access_token(access_token):
         if isinstance(access_token, bytes):
             access_token = access_token.decode("ascii")
+        verified = access_token_cache.get(access_token)
+        if not verified:
+            result = User._verify_access_token(access_token)
+            if result.failure:
+                return result
+            verified = result.value
+            access_token_cache.set(access_token, verified, expires_at=verified[1]["exp"])
+        access_token, payload = verified
+
+        if BlacklistedToken.check_blacklist(access_token):
+            error = "Token blacklisted. Please log in again."
+            return Result.Fail(error)
+        user_dict = dict(
+            public_id=payload["sub"],
+            admin=payload["admin"],
+            token=access_token,
+            expires_at=payload["exp"],
+        )
+        return Result.Ok(user_dict)
+
+    @staticmethod
+    def _verify_access_token(access_token):
         if access_token.startswith("Bearer "):
             split = access_token.split("Bearer")
             access_token = split[1].strip()
@@ -81,17 +111,7 @@ class User(db.Model):
         except jwt.InvalidTokenError:
             error = "Invalid token. Please log in again."
             return Result.Fail(error)
-
-        if BlacklistedToken.check_blacklist(access_token):
-            error = "Token blacklisted. Please log in again."
-            return Result.Fail(error)
-        user_dict = dict(
-            public_id=payload["sub"],
-            admin=payload["admin"],
-            token=access_token,
-            expires_at=payload["exp"],
-        )
-        return Result.Ok(user_dict)
+        return Result.Ok((access_token, payload))
 
     @classmethod
     def find_by_email(cls, email):
@@ -100,3 +120,30 @@ class User(db.Model):
     @classmethod
     def find_by_public_id(cls, public_id):
         return cls.query.filter_by(public_id=public_id).first()
+
+    @classmethod
+    def find_by_public_id_cached(cls, public_id):
+        column_values = user_cache.get(public_id)
+        if column_values:
+            user = cls(**column_values)
+            make_transient_to_detached(user)
+            return db.session.merge(user, load=False)
+        user = cls.find_by_public_id(public_id)
+        if user:
+            ttl = current_app.config.get("USER_CACHE_TTL_SECONDS")
+            user_cache.set(public_id, user.column_values, expires_at=time.time() + ttl)
+        return user
+
+    @property
+    def column_values(self):
+        return {attr.key: getattr(self, attr.key) for attr in inspect(User).column_attrs}
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def invalidate_cached_user(mapper, connection, target):
+    user_cache.delete(target.public_id)
+
+
+access_token_cache = LRUCache("ACCESS_TOKEN_CACHE_SIZE", max_size=0)
+user_cache = LRUCache("USER_CACHE_SIZE", max_size=0)
@@ -1,11 +1,18 @@
 """Class definition for Widget model."""
-from datetime import datetime, timezone, timedelta
+import time
+from datetime import timezone, timedelta
 
+from flask import current_app
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.hybrid import hybrid_property
 
 from flask_api_tutorial import db
+from flask_api_tutorial.models.user import User
+from flask_api_tutorial.util.cache import LRUCache
 from flask_api_tutorial.util.datetime_util import (
     utc_now,
+    clock_snapshot,
     format_timedelta_str,
     get_local_utcoffset,
     localized_dt_string,
@@ -17,16 +24,26 @@ class Widget(db.Model):
     """Widget model for a generic resource in a REST API."""
 
     __tablename__ = "widget"
+    __table_args__ = (
+        db.Index("ix_widget_created_at_id", "created_at", "id"),
+        db.Index("ix_widget_deadline_id", "deadline", "id"),
+        db.Index("ix_widget_owner_id_created_at_id", "owner_id", "created_at", "id"),
+        db.Index("ix_widget_owner_id_deadline_id", "owner_id", "deadline", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     name = db.Column(db.String(100), unique=True, nullable=False)
     info_url = db.Column(db.String(255))
     created_at = db.Column(db.DateTime, default=utc_now)
     deadline = db.Column(db.DateTime)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default="1")
+    updated_at = db.Column(db.DateTime, default=utc_now, onupdate=utc_now)
 
     owner_id = db.Column(db.Integer, db.ForeignKey("site_user.id"), nullable=False)
     owner = db.relationship("User", backref=db.backref("widgets"))
 
+    __mapper_args__ = {"version_id_col": version}
+
     def __repr__(self):
         return f"<Widget name={self.name}, info_url={self.info_url}>"
 
@@ -44,18 +61,137 @@ class Widget(db.Model):
 
     @hybrid_property
     def deadline_passed(self):
-        return datetime.now(timezone.utc) > self.deadline.replace(tzinfo=timezone.utc)
+        return clock_snapshot() > self.deadline.replace(tzinfo=timezone.utc)
 
     @hybrid_property
     def time_remaining(self):
-        time_remaining = self.deadline.replace(tzinfo=timezone.utc) - utc_now()
-        return time_remaining if not self.deadline_passed else timedelta(0)
+        time_remaining = self._time_remaining(clock_snapshot())
+        return time_remaining if time_remaining is not None else timedelta(0)
 
     @hybrid_property
     def time_remaining_str(self):
-        timedelta_str = format_timedelta_str(self.time_remaining)
-        return timedelta_str if not self.deadline_passed else "No time remaining"
+        time_remaining = self._time_remaining(clock_snapshot())
+        if time_remaining is None:
+            return "No time remaining"
+        return format_timedelta_str(time_remaining)
+
+    @property
+    def etag(self):
+        return f"{self.id}.{self.version}"
+
+    @property
+    def last_modified(self):
+        return self.updated_at or self.created_at
+
+    def _time_remaining(self, now):
+        deadline = self.deadline.replace(tzinfo=timezone.utc)
+        if now > deadline:
+            return None
+        return deadline - now.replace(microsecond=0)
+
+    @classmethod
+    def list_order(cls, sort="created_at"):
+        column = cls.deadline if sort == "deadline" else cls.created_at
+        return (column, cls.id)
+
+    @classmethod
+    def search(
+        cls,
+        owner=None,
+        deadline_after=None,
+        deadline_before=None,
+        deadline_passed=None,
+        name_prefix=None,
+    ):
+        query = cls.query
+        if owner:
+            owner_id = select([User.id]).where(User.public_id == owner).scalar_subquery()
+            query = query.filter(cls.owner_id == owner_id)
+        if deadline_after:
+            query = query.filter(cls.deadline >= deadline_after)
+        if deadline_before:
+            query = query.filter(cls.deadline <= deadline_before)
+        if deadline_passed is not None:
+            now = clock_snapshot().replace(tzinfo=None)
+            query = query.filter(
+                cls.deadline < now if deadline_passed else cls.deadline >= now
+            )
+        if name_prefix:
+            upper_bound = name_prefix[:-1] + chr(ord(name_prefix[-1]) + 1)
+            query = query.filter(cls.name >= name_prefix, cls.name < upper_bound)
+        return query
+
+    @classmethod
+    def name_matches(cls, name):
+        return func.lower(cls.name) == name.lower()
 
     @classmethod
     def find_by_name(cls, name):
-        return cls.query.filter_by(name=name).first()
+        return cls.query.filter(cls.name_matches(name)).first()
+
+    @classmethod
+    def upsert(cls, name, info_url, deadline, owner_id):
+        insert = UPSERT_DIALECTS.get(db.engine.dialect.name)
+        if not insert:
+            return None
+        widget = cls.__table__
+        now = utc_now()
+        statement = insert(widget).values(
+            name=name,
+            info_url=info_url,
+            deadline=deadline,
+            owner_id=owner_id,
+            created_at=now,
+            updated_at=now,
+            version=1,
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[func.lower(widget.c.name)],
+            set_=dict(
+                info_url=statement.excluded.info_url,
+                deadline=statement.excluded.deadline,
+                updated_at=now,
+                version=widget.c.version + 1,
+            ),
+        )
+        if db.engine.dialect.name == "postgresql":
+            statement = statement.returning(widget.c.id, widget.c.version)
+            return db.session.execute(statement).one()
+        db.session.execute(statement)
+        query = select(widget.c.id, widget.c.version).where(cls.name_matches(name))
+        return db.session.execute(query).one()
+
+    @classmethod
+    def total_count(cls, count_mode="exact", filters=None):
+        filters = {k: v for k, v in (filters or {}).items() if v is not None}
+        if count_mode == "none":
+            return None, "none"
+        if count_mode == "estimate" and not filters:
+            return cls.estimated_count(), "estimate"
+        cache_key = f"{cls.__tablename__}:{sorted(filters.items())}"
+        total = widget_count_cache.get(cache_key)
+        if total is not None:
+            return total, "cached"
+        total = cls.search(**filters).order_by(None).count()
+        if "deadline_passed" not in filters:
+            ttl = current_app.config.get("WIDGET_COUNT_CACHE_TTL_SECONDS")
+            widget_count_cache.set(cache_key, total, expires_at=time.time() + ttl)
+        return total, "exact"
+
+    @classmethod
+    def estimated_count(cls):
+        if db.engine.dialect.name == "postgresql":
+            reltuples = db.session.execute(
+                text("SELECT reltuples FROM pg_class WHERE relname = :table"),
+                dict(table=cls.__tablename__),
+            ).scalar()
+            if reltuples is not None and reltuples >= 0:
+                return int(reltuples)
+        max_id = db.session.query(func.max(cls.id)).scalar()
+        min_id = db.session.query(func.min(cls.id)).scalar()
+        return max_id - min_id + 1 if max_id is not None else 0
+
+
+db.Index("ix_widget_name_lower", func.lower(Widget.name), unique=True)
+UPSERT_DIALECTS = dict(postgresql=postgresql.insert, sqlite=sqlite.insert)
+widget_count_cache = LRUCache("WIDGET_COUNT_CACHE_SIZE", max_size=0)
@@ -0,0 +1,55 @@
+"""Bloom filter for fast negative membership tests."""
+import hashlib
+import math
+from threading import Lock
+
+
+class BloomFilter:
+    """Probabilistic set: "not present" answers are always correct."""
+
+    def __init__(self, size_bytes, num_hashes=7):
+        self.num_bits = size_bytes * 8
+        self.num_hashes = num_hashes
+        self.items_added = 0
+        self._bits = bytearray(size_bytes)
+        self._lock = Lock()
+
+    def __contains__(self, item):
+        return all(self._bits[i >> 3] & (1 << (i & 7)) for i in self._positions(item))
+
+    def add(self, item):
+        """Set the bits for item, the filter can never remove an item once added."""
+        with self._lock:
+            for i in self._positions(item):
+                self._bits[i >> 3] |= 1 << (i & 7)
+            self.items_added += 1
+
+    @property
+    def memory_bytes(self):
+        """Size of the bit array in bytes."""
+        return len(self._bits)
+
+    @property
+    def estimated_false_positive_rate(self):
+        """Expected rate of false positives given the number of items added."""
+        if not self.num_bits:
+            return 1.0
+        exponent = -self.num_hashes * self.items_added / self.num_bits
+        return (1 - math.exp(exponent)) ** self.num_hashes
+
+    def stats(self):
+        """Size, item count and expected false positive rate of the filter."""
+        return dict(
+            memory_bytes=self.memory_bytes,
+            num_hashes=self.num_hashes,
+            items_added=self.items_added,
+            estimated_false_positive_rate=self.estimated_false_positive_rate,
+        )
+
+    def _positions(self, item):
+        if isinstance(item, str):
+            item = item.encode("utf-8")
+        digest = hashlib.sha256(item).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:16], "little") | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
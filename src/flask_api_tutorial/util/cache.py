@@ -0,0 +1,103 @@
+"""Thread-safe in-process LRU cache with optional per-entry expiration."""
+import time
+from collections import OrderedDict
+from threading import Lock
+
+
+class LRUCache:
+    """Bounded mapping that evicts the least-recently used entry when full."""
+
+    def __init__(self, config_key=None, max_size=128):
+        self.config_key = config_key
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def init_app(self, app):
+        """Read the maximum size from the app config and empty the cache."""
+        if self.config_key:
+            self.max_size = app.config.get(self.config_key, self.max_size)
+        self.clear()
+
+    @property
+    def enabled(self):
+        """Flag that indicates if the cache is allowed to store any entries."""
+        return bool(self.max_size)
+
+    def get(self, key, default=None):
+        """Value stored for key, or default if key is missing or has expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, expires_at=None):
+        """Store value for key, expires_at is an optional UNIX timestamp."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._evict_oldest()
+
+    def delete(self, key):
+        """Remove key from the cache if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def purge_expired(self):
+        """Remove all expired entries and return the number removed."""
+        now = time.time()
+        with self._lock:
+            expired = [
+                key
+                for key, (_, expires_at) in self._entries.items()
+                if expires_at is not None and expires_at <= now
+            ]
+            for key in expired:
+                del self._entries[key]
+        return len(expired)
+
+    def invalidate(self):
+        """Remove all entries without resetting statistics."""
+        with self._lock:
+            self._entries.clear()
+
+    def clear(self):
+        """Remove all entries and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        """Current size, capacity and hit/miss/eviction counters."""
+        return dict(
+            size=len(self._entries),
+            max_size=self.max_size,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+        )
+
+    def _evict_oldest(self):
+        _, (_, expires_at) = self._entries.popitem(last=False)
+        if expires_at is None or expires_at > time.time():
+            self.evictions += 1
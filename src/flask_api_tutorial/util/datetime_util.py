@@ -2,12 +2,16 @@
 import time
 from collections import namedtuple
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+from flask import _app_ctx_stack, g
 
 
 DT_AWARE = "%m/%d/%y %I:%M:%S %p %Z"
 DT_NAIVE = "%m/%d/%y %I:%M:%S %p"
 DATE_MONTH_NAME = "%b %d %Y"
 ONE_DAY_IN_SECONDS = 86400
+UTCOFFSET_CACHE_SECONDS = 900
 
 timespan = namedtuple(
     "timespan",
@@ -25,9 +29,33 @@ timespan = namedtuple(
 )
 
 
+class RequestClock:
+    """Read the clock once at the start of each request and reuse it until the end."""
+
+    def init_app(self, app):
+        """Register request hooks that take and discard the clock snapshot."""
+        app.before_request(self.take_snapshot)
+        app.teardown_request(self.discard_snapshot)
+
+    def take_snapshot(self):
+        """Store the current UTC date and time for the rest of the request."""
+        g.clock_snapshot = datetime.now(timezone.utc)
+
+    def discard_snapshot(self, exc=None):
+        """Remove the stored date and time when the request ends."""
+        g.pop("clock_snapshot", None)
+
+
+def clock_snapshot():
+    """Current UTC date and time, fixed for the duration of the current request."""
+    app_ctx = _app_ctx_stack.top
+    snapshot = getattr(app_ctx.g, "clock_snapshot", None) if app_ctx else None
+    return snapshot or datetime.now(timezone.utc)
+
+
 def utc_now():
     """Current UTC date and time with the microsecond value normalized to zero."""
-    return datetime.now(timezone.utc).replace(microsecond=0)
+    return clock_snapshot().replace(microsecond=0)
 
 
 def localized_dt_string(dt, use_tz=None):
@@ -40,9 +68,18 @@ def localized_dt_string(dt, use_tz=None):
 
 
 def get_local_utcoffset():
-    """Get UTC offset from local system and return as timezone object."""
-    utc_offset = timedelta(seconds=time.localtime().tm_gmtoff)
-    return timezone(offset=utc_offset)
+    """Get UTC offset from local system and return as timezone object.
+
+    Time zone transitions fall on quarter-hour boundaries, so the offset is looked up
+    at most once per 15-minute interval.
+    """
+    return _local_utcoffset(int(time.time() // UTCOFFSET_CACHE_SECONDS))
+
+
+@lru_cache(maxsize=1)
+def _local_utcoffset(interval):
+    local_time = time.localtime(interval * UTCOFFSET_CACHE_SECONDS)
+    return timezone(offset=timedelta(seconds=local_time.tm_gmtoff))
 
 
 def make_tzaware(dt, use_tz=None, localize=True):
@@ -61,7 +98,7 @@ def dtaware_fromtimestamp(timestamp, use_tz=None):
 
 def remaining_fromtimestamp(timestamp):
     """Calculate time remaining from now until UNIX timestamp value."""
-    now = datetime.now(timezone.utc)
+    now = clock_snapshot()
     dt_aware = dtaware_fromtimestamp(timestamp, use_tz=timezone.utc)
     if dt_aware < now:
         return timespan(0, 0, 0, 0, 0, 0, 0, 0, 0)
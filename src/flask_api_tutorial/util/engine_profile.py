@@ -0,0 +1,65 @@
+"""Database engine options and SQLite connection pragmas selected by profile name."""
+from flask_sqlalchemy import SQLAlchemy as BaseSQLAlchemy
+from sqlalchemy import event, orm
+from sqlalchemy.pool import QueuePool
+
+from flask_api_tutorial.config import ENGINE_PROFILES
+from flask_api_tutorial.util.read_replica import RoutingSession
+
+POOL_OPTIONS = ("pool_size", "max_overflow", "pool_timeout", "pool_recycle")
+
+
+def engine_options(profile, drivername):
+    """create_engine keyword arguments for a profile and database driver."""
+    options = {option: profile[option] for option in POOL_OPTIONS if option in profile}
+    if drivername.startswith("sqlite"):
+        options["poolclass"] = QueuePool
+        options["connect_args"] = dict(check_same_thread=False)
+        options["sqlite_pragmas"] = profile.get("sqlite_pragmas", {})
+    else:
+        options["pool_pre_ping"] = profile.get("pool_pre_ping", False)
+    return options
+
+
+def set_sqlite_pragmas(dbapi_connection, pragmas):
+    """Execute PRAGMA statements on a new SQLite connection, in the given order."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+class SQLAlchemy(BaseSQLAlchemy):
+    """Flask-SQLAlchemy extension that configures engines with DATABASE_ENGINE_PROFILE.
+
+    Server databases get the pool size, overflow, timeout, recycle and pre-ping
+    options of the profile. SQLite file databases get a pool of connections that are
+    reused across threads, and the profile's pragmas (e.g. journal_mode=WAL) are
+    applied to every new connection. When DATABASE_ENGINE_PROFILE is None, engines
+    use the Flask-SQLAlchemy defaults. SQLALCHEMY_ENGINE_OPTIONS overrides the
+    profile. Sessions route read-only work to replica binds (see RoutingSession).
+    """
+
+    def create_session(self, options):
+        return orm.sessionmaker(class_=RoutingSession, db=self, **options)
+
+    def apply_driver_hacks(self, app, sa_url, options):
+        profile_name = app.config.get("DATABASE_ENGINE_PROFILE")
+        in_memory = sa_url.database in (None, "", ":memory:")
+        if profile_name and not in_memory:
+            profile = ENGINE_PROFILES[profile_name]
+            options.update(engine_options(profile, sa_url.drivername))
+        return super().apply_driver_hacks(app, sa_url, options)
+
+    def create_engine(self, sa_url, engine_opts):
+        pragmas = engine_opts.pop("sqlite_pragmas", None)
+        engine = super().create_engine(sa_url, engine_opts)
+        if pragmas:
+
+            def on_connect(dbapi_connection, connection_record):
+                set_sqlite_pragmas(dbapi_connection, pragmas)
+
+            event.listen(engine, "connect", on_connect)
+        return engine
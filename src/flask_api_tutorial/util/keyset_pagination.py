@@ -0,0 +1,105 @@
+"""Keyset (seek) pagination with opaque cursors."""
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from sqlalchemy import tuple_
+
+
+def encode_cursor(values):
+    """Encode a tuple of sort key values as an opaque, URL-safe string."""
+    if not values:
+        return ""
+    values_json = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else v for v in values],
+        separators=(",", ":"),
+    )
+    return urlsafe_b64encode(values_json.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Decode a string produced by encode_cursor, returns a list of JSON values."""
+    if not cursor:
+        return []
+    padding = "=" * (-len(cursor) % 4)
+    try:
+        values = json.loads(urlsafe_b64decode(cursor + padding))
+    except (TypeError, ValueError):
+        raise ValueError(f"'{cursor}' is not a valid pagination cursor.")
+    if not isinstance(values, list):
+        raise ValueError(f"'{cursor}' is not a valid pagination cursor.")
+    return values
+
+
+class KeysetPagination:
+    """Page of query results selected with a seek condition instead of OFFSET.
+
+    The query is ordered by key_columns, which must be unique when combined (e.g.
+    (created_at, id)) and should be covered by an index. after/before are tuples of
+    key values for the item just before/after the requested page, an empty tuple
+    requests the first/last page. If descending is True, the list is ordered from the
+    highest key to the lowest. No COUNT query is issued, so the total number of
+    items and pages is unknown.
+    """
+
+    page = None
+    pages = None
+    total = None
+    count_mode = "none"
+
+    def __init__(
+        self, query, key_columns, per_page, after=None, before=None, descending=False
+    ):
+        self.key_columns = key_columns
+        self.per_page = per_page
+        self.after = after
+        self.before = before
+        key = tuple_(*key_columns)
+        ascending_order = [column.asc() for column in key_columns]
+        descending_order = [column.desc() for column in key_columns]
+        if before is not None:
+            if before:
+                cursor = tuple_(*before)
+                query = query.filter(key > cursor if descending else key < cursor)
+            query = query.order_by(
+                *(ascending_order if descending else descending_order)
+            )
+            rows = query.limit(per_page + 1).all()
+            self.items = list(reversed(rows[:per_page]))
+            self.has_prev = len(rows) > per_page
+            self.has_next = bool(before)
+        else:
+            if after:
+                cursor = tuple_(*after)
+                query = query.filter(key < cursor if descending else key > cursor)
+            query = query.order_by(
+                *(descending_order if descending else ascending_order)
+            )
+            rows = query.limit(per_page + 1).all()
+            self.items = rows[:per_page]
+            self.has_next = len(rows) > per_page
+            self.has_prev = bool(after)
+
+    @property
+    def cursor_args(self):
+        """Query string arguments that request this page again."""
+        if self.before is not None:
+            return dict(before=encode_cursor(self.before))
+        return dict(after=encode_cursor(self.after or ()))
+
+    @property
+    def next_cursor(self):
+        """Cursor for the page after this one, None if this is the last page."""
+        if not self.has_next or not self.items:
+            return None
+        return encode_cursor(self._item_key(self.items[-1]))
+
+    @property
+    def prev_cursor(self):
+        """Cursor for the page before this one, None if this is the first page."""
+        if not self.has_prev or not self.items:
+            return None
+        return encode_cursor(self._item_key(self.items[0]))
+
+    def _item_key(self, item):
+        return tuple(getattr(item, column.key) for column in self.key_columns)
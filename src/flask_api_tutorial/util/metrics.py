@@ -0,0 +1,51 @@
+"""Lightweight in-process latency metrics."""
+import math
+from collections import deque
+from threading import Lock
+
+
+class LatencyStats:
+    """Thread-safe count/mean/max of all samples plus percentiles of recent samples."""
+
+    def __init__(self, max_samples=1000):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self._samples = deque(maxlen=max_samples)
+        self._lock = Lock()
+
+    def record(self, seconds):
+        """Add a latency sample, measured in seconds."""
+        with self._lock:
+            self.count += 1
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+            self._samples.append(seconds)
+
+    def percentile(self, pct):
+        """Nearest-rank percentile (0-100) of the most recent samples, in seconds."""
+        with self._lock:
+            samples = sorted(self._samples)
+        return percentile(samples, pct)
+
+    def summary(self):
+        """Sample count and mean/p50/p95/p99/max latency in milliseconds."""
+        with self._lock:
+            samples = sorted(self._samples)
+            count, total, max_seconds = self.count, self.total_seconds, self.max_seconds
+        return dict(
+            count=count,
+            mean_ms=(total / count * 1000) if count else 0.0,
+            p50_ms=percentile(samples, 50) * 1000,
+            p95_ms=percentile(samples, 95) * 1000,
+            p99_ms=percentile(samples, 99) * 1000,
+            max_ms=max_seconds * 1000,
+        )
+
+
+def percentile(sorted_samples, pct):
+    """Nearest-rank percentile (0-100) of a sorted list, 0.0 if the list is empty."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_samples)), 1)
+    return sorted_samples[rank - 1]
@@ -0,0 +1,29 @@
+"""LIMIT/OFFSET pagination where the total item count is optional."""
+from flask_sqlalchemy import Pagination
+
+
+class OffsetPagination(Pagination):
+    """Pagination that takes the total from the caller instead of running COUNT(*).
+
+    total may be exact, cached, estimated or None (unknown), and count_mode records
+    which of these it is. One extra row is fetched so that has_next is accurate even
+    when the total is estimated or unknown.
+    """
+
+    def __init__(self, query, page, per_page, total=None, count_mode="none"):
+        rows = query.limit(per_page + 1).offset((page - 1) * per_page).all()
+        super().__init__(query, page, per_page, total, rows[:per_page])
+        self.count_mode = count_mode
+        self._has_next = len(rows) > per_page
+
+    @property
+    def pages(self):
+        """The total number of pages, None if the total is unknown."""
+        if self.total is None:
+            return None
+        return super().pages
+
+    @property
+    def has_next(self):
+        """True if a next page exists."""
+        return self._has_next
@@ -0,0 +1,163 @@
+"""Run bcrypt password hashing and verification on a bounded worker pool."""
+import hmac
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from threading import BoundedSemaphore, Lock
+
+import bcrypt
+from flask import current_app
+
+from flask_api_tutorial.util.metrics import LatencyStats
+
+EXECUTOR_TYPES = dict(thread=ThreadPoolExecutor, process=ProcessPoolExecutor)
+
+
+class PasswordHashPoolFull(Exception):
+    """Raised when every worker is busy and the wait queue is full."""
+
+    def __init__(self, retry_after):
+        self.retry_after = retry_after
+        super().__init__("Server is busy, please try again later.")
+
+
+class PasswordHasher:
+    """Hash and verify passwords on a thread or process pool with a bounded queue.
+
+    At most PASSWORD_HASH_POOL_WORKERS + PASSWORD_HASH_POOL_QUEUE_SIZE operations
+    can be in flight. Any operation beyond that fails immediately with
+    PasswordHashPoolFull instead of tying up the calling worker. When
+    PASSWORD_HASH_POOL is None, operations run inline in the calling thread.
+    """
+
+    def __init__(self):
+        self.executor = None
+        self.retry_after = 1
+        self.in_flight = 0
+        self.rejected = 0
+        self.queue_wait = LatencyStats()
+        self.hash_time = LatencyStats()
+        self._slots = None
+        self._lock = Lock()
+
+    def init_app(self, app):
+        """Create the worker pool described by the app config."""
+        self.shutdown()
+        self.retry_after = app.config.get("PASSWORD_HASH_RETRY_AFTER", 1)
+        self.in_flight = 0
+        self.rejected = 0
+        self.queue_wait = LatencyStats()
+        self.hash_time = LatencyStats()
+        pool_type = app.config.get("PASSWORD_HASH_POOL")
+        if not pool_type:
+            return
+        workers = app.config.get("PASSWORD_HASH_POOL_WORKERS")
+        queue_size = app.config.get("PASSWORD_HASH_POOL_QUEUE_SIZE")
+        self.executor = EXECUTOR_TYPES[pool_type](max_workers=workers)
+        self._slots = BoundedSemaphore(workers + queue_size)
+
+    def shutdown(self):
+        """Stop the worker pool (if any), waiting for running operations to finish."""
+        if self.executor:
+            self.executor.shutdown(wait=True)
+        self.executor = None
+        self._slots = None
+
+    def generate_password_hash(self, password, rounds):
+        """bcrypt hash of password using 2**rounds iterations, as a str."""
+        return self.run(hash_password, password, rounds)
+
+    def check_password_hash(self, password_hash, password):
+        """True if password matches password_hash."""
+        return self.run(verify_password, password_hash, password)
+
+    def run(self, func, *args):
+        """Call func(*args) on the pool and wait for the result."""
+        if not self.executor:
+            result, elapsed = timed_call(func, *args)
+            self.hash_time.record(elapsed)
+            return result
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHashPoolFull(self.retry_after)
+        with self._lock:
+            self.in_flight += 1
+        try:
+            submitted = time.perf_counter()
+            future = self.executor.submit(timed_call, func, *args)
+            result, elapsed = future.result()
+            self.hash_time.record(elapsed)
+            self.queue_wait.record(time.perf_counter() - submitted - elapsed)
+            return result
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            self._slots.release()
+
+    def stats(self):
+        """Pool usage counters and queue wait/hash latency summaries."""
+        with self._lock:
+            in_flight, rejected = self.in_flight, self.rejected
+        return dict(
+            in_flight=in_flight,
+            rejected=rejected,
+            queue_wait=self.queue_wait.summary(),
+            hash_time=self.hash_time.summary(),
+        )
+
+    def log_stats(self):
+        """Log pool usage and latency percentiles, used to size the pool per core."""
+        stats = self.stats()
+        queue_wait, hash_time = stats["queue_wait"], stats["hash_time"]
+        current_app.logger.info(
+            f"Password hash pool: {stats['in_flight']} in flight, "
+            f"{stats['rejected']} rejected, {hash_time['count']} hashed, "
+            f"queue wait p50/p95/p99 {queue_wait['p50_ms']:.1f}/"
+            f"{queue_wait['p95_ms']:.1f}/{queue_wait['p99_ms']:.1f} ms, "
+            f"hash time p50/p95/p99 {hash_time['p50_ms']:.1f}/"
+            f"{hash_time['p95_ms']:.1f}/{hash_time['p99_ms']:.1f} ms"
+        )
+        return stats
+
+
+def get_hash_rounds(password_hash):
+    """Cost factor (log2 of iterations) encoded in a bcrypt hash."""
+    return int(password_hash.split("$")[2])
+
+
+def calibrate_rounds(target_ms, min_rounds=4, max_rounds=16, samples=3):
+    """Highest cost factor whose verify time stays within target_ms on this machine.
+
+    Returns the chosen number of rounds and the measured verify time in milliseconds
+    for every cost factor that was tried. Each extra round doubles the cost, so the
+    search stops at the first cost factor that exceeds the target.
+    """
+    chosen, timings = min_rounds, {}
+    for rounds in range(min_rounds, max_rounds + 1):
+        password_hash = hash_password("calibrate", rounds)
+        elapsed = min(
+            timed_call(verify_password, password_hash, "calibrate")[1]
+            for _ in range(samples)
+        )
+        timings[rounds] = elapsed * 1000
+        if timings[rounds] > target_ms:
+            break
+        chosen = rounds
+    return chosen, timings
+
+
+def timed_call(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def hash_password(password, rounds):
+    salt = bcrypt.gensalt(rounds=rounds)
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+
+
+def verify_password(password_hash, password):
+    password_hash = password_hash.encode("utf-8")
+    hashed = bcrypt.hashpw(password.encode("utf-8"), password_hash)
+    return hmac.compare_digest(hashed, password_hash)
@@ -0,0 +1,64 @@
+"""Run a function periodically in a background thread."""
+import threading
+
+
+class PeriodicTask:
+    """Call func inside an app context every N seconds, N is read from app config."""
+
+    def __init__(self, func, config_key):
+        self.func = func
+        self.config_key = config_key
+        self.interval_seconds = 0
+        self.runs = 0
+        self.last_result = None
+        self.last_error = None
+        self._app = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def init_app(self, app):
+        """Start the background thread if the configured interval is non-zero."""
+        self.stop()
+        self._app = app
+        self.interval_seconds = app.config.get(self.config_key, 0)
+        if self.interval_seconds:
+            self.start()
+
+    @property
+    def running(self):
+        """Flag that indicates if the background thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start calling func every interval_seconds in a daemon thread."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=self.func.__name__, daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Signal the background thread to exit and wait for it to finish."""
+        self._stop.set()
+        if self.running:
+            self._thread.join()
+        self._thread = None
+
+    def run_once(self):
+        """Call func immediately (inside an app context) and record the outcome."""
+        with self._app.app_context():
+            try:
+                self.last_result = self.func()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+                self._app.logger.exception(f"Periodic task {self.func.__name__} failed")
+            finally:
+                self.runs += 1
+        return self.last_result
+
+    def _run(self):
+        while not self._stop.wait(self.interval_seconds):
+            self.run_once()
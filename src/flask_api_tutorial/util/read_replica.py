@@ -0,0 +1,115 @@
+"""Route read-only database work to replica binds."""
+import sqlite3
+import time
+from functools import wraps
+from itertools import count
+
+from flask import current_app
+from flask_sqlalchemy import SignallingSession
+
+
+class ReadReplicaRouter:
+    """Send queries made by read-only functions to the READ_REPLICA_BINDS engines.
+
+    Functions wrapped with read_only run their SELECT statements on a replica,
+    chosen round-robin. Everything else uses the primary: flushes, INSERT/UPDATE/
+    DELETE statements, and every read made by a session that has written. After a
+    write, all reads in this process go to the primary for READ_REPLICA_PIN_SECONDS
+    so clients read their own writes while the replicas catch up.
+    """
+
+    def __init__(self):
+        self.db = None
+        self.binds = ()
+        self.pin_seconds = 0
+        self.last_write = None
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self._next_bind = count()
+
+    def init_app(self, app, db):
+        """Read replica bind keys and the read-after-write window from app config."""
+        self.db = db
+        self.binds = tuple(app.config.get("READ_REPLICA_BINDS") or ())
+        self.pin_seconds = app.config.get("READ_REPLICA_PIN_SECONDS", 0)
+        self.last_write = None
+        self.replica_reads = 0
+        self.primary_reads = 0
+        app.extensions["read_replica_router"] = self
+
+    def read_only(self, func):
+        """Decorator that lets func read from a replica."""
+        return self._route(func, read_only=True)
+
+    def primary(self, func):
+        """Decorator that makes func read from the primary, even in read-only code."""
+        return self._route(func, read_only=False)
+
+    def _route(self, func, read_only):
+        @wraps(func)
+        def decorated(*args, **kwargs):
+            session = self.db.session()
+            previous = session.info.get("read_only", False)
+            session.info["read_only"] = read_only
+            try:
+                return func(*args, **kwargs)
+            finally:
+                session.info["read_only"] = previous
+
+        return decorated
+
+    def replica_engine(self, session):
+        """Engine of the replica that should run the next read, None for primary."""
+        if not self.binds or not session.info.get("read_only"):
+            return None
+        if session.info.get("pinned") or self.pinned or session._flushing:
+            self.primary_reads += 1
+            return None
+        self.replica_reads += 1
+        bind = self.binds[next(self._next_bind) % len(self.binds)]
+        return self.db.get_engine(session.app, bind=bind)
+
+    @property
+    def pinned(self):
+        """Flag that indicates if reads must use the primary after a recent write."""
+        if self.last_write is None:
+            return False
+        return time.monotonic() - self.last_write < self.pin_seconds
+
+    def record_write(self, session):
+        """Pin session and, for READ_REPLICA_PIN_SECONDS, this process to primary."""
+        session.info["pinned"] = True
+        self.last_write = time.monotonic()
+
+    def sync_sqlite_replicas(self):
+        """Copy the primary SQLite database over every replica, a stand-in replicator."""
+        if not self.binds:
+            return 0
+        primary = self.db.get_engine(current_app).url.database
+        for bind in self.binds:
+            replica = self.db.get_engine(current_app, bind=bind).url.database
+            source, target = sqlite3.connect(primary), sqlite3.connect(replica)
+            try:
+                source.backup(target)
+            finally:
+                source.close()
+                target.close()
+        return len(self.binds)
+
+
+class RoutingSession(SignallingSession):
+    """Session that asks the app's ReadReplicaRouter which engine runs a statement."""
+
+    def __init__(self, db, **options):
+        super().__init__(db, **options)
+        self.router = self.app.extensions.get("read_replica_router")
+
+    def get_bind(self, mapper=None, clause=None):
+        if self.router and self.router.binds:
+            if self._flushing or getattr(clause, "is_dml", False):
+                self.router.record_write(self)
+            else:
+                engine = self.router.replica_engine(self)
+                if engine:
+                    return engine
+        return super().get_bind(mapper, clause)
@@ -0,0 +1,154 @@
+"""Cache of serialized API responses with in-process and SQLite storage backends."""
+import json
+import sqlite3
+import time
+from threading import local
+
+from flask_api_tutorial.util.cache import LRUCache
+
+
+class MemoryBackend:
+    """Entries stored in an LRU cache, private to the current process."""
+
+    def __init__(self, max_size):
+        self.entries = LRUCache(max_size=max_size)
+
+    def get(self, key):
+        """Entry stored for key, None if missing or expired."""
+        return self.entries.get(key)
+
+    def set(self, key, entry, expires_at):
+        """Store entry for key until the expires_at UNIX timestamp."""
+        self.entries.set(key, entry, expires_at=expires_at)
+
+    def clear(self):
+        """Remove all entries."""
+        self.entries.invalidate()
+
+    def stats(self):
+        """Size, capacity and hit/miss/eviction counters."""
+        return self.entries.stats()
+
+
+class SQLiteBackend:
+    """Entries stored in a SQLite file, shared by every process that opens it."""
+
+    def __init__(self, path, max_size):
+        self.path = path
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._local = local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache "
+                "(key TEXT PRIMARY KEY, entry TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def get(self, key):
+        """Entry stored for key, None if missing or expired."""
+        row = (
+            self._connect()
+            .execute(
+                "SELECT entry FROM response_cache WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+        if not row:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key, entry, expires_at):
+        """Store entry for key until the expires_at UNIX timestamp."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO response_cache VALUES (?, ?, ?)",
+                (key, json.dumps(entry), expires_at),
+            )
+            conn.execute(
+                "DELETE FROM response_cache WHERE expires_at <= ? OR key NOT IN "
+                "(SELECT key FROM response_cache ORDER BY expires_at DESC LIMIT ?)",
+                (time.time(), self.max_size),
+            )
+
+    def clear(self):
+        """Remove all entries."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM response_cache")
+
+    def stats(self):
+        """Size, capacity and hit/miss counters for this process."""
+        size = self._connect().execute("SELECT COUNT(*) FROM response_cache").fetchone()
+        return dict(
+            size=size[0], max_size=self.max_size, hits=self.hits, misses=self.misses
+        )
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.isolation_level = ""
+            self._local.conn = conn
+        return conn
+
+
+BACKENDS = dict(memory=MemoryBackend, sqlite=SQLiteBackend)
+
+
+class ResponseCache:
+    """Serialized response bodies and headers, stored in a pluggable backend.
+
+    RESPONSE_CACHE selects the backend: "memory" (per process), "sqlite" (shared
+    through the file at RESPONSE_CACHE_PATH) or None to disable caching. Callers
+    must invalidate the cache after every write. Entries expire after at most
+    RESPONSE_CACHE_TTL_SECONDS, which bounds how stale time-dependent fields can be
+    and how long a write made by a process using a different backend can go unseen.
+    """
+
+    def __init__(self):
+        self.backend = None
+        self.ttl = 0
+
+    def init_app(self, app):
+        """Create the backend described by the app config."""
+        self.ttl = app.config.get("RESPONSE_CACHE_TTL_SECONDS", 5)
+        backend = app.config.get("RESPONSE_CACHE")
+        max_size = app.config.get("RESPONSE_CACHE_SIZE", 1024)
+        if backend == "sqlite":
+            self.backend = SQLiteBackend(app.config["RESPONSE_CACHE_PATH"], max_size)
+        elif backend:
+            self.backend = BACKENDS[backend](max_size)
+        else:
+            self.backend = None
+
+    @property
+    def enabled(self):
+        """Flag that indicates if a backend is configured."""
+        return bool(self.backend and self.ttl)
+
+    def get(self, key):
+        """Cached entry (a dict with body and headers) for key, or None."""
+        if not self.enabled:
+            return None
+        return self.backend.get(key)
+
+    def set(self, key, body, headers, expires_at=None):
+        """Cache body and headers for key, expires_at can shorten the TTL."""
+        if not self.enabled:
+            return
+        max_expires_at = time.time() + self.ttl
+        expires_at = min(expires_at, max_expires_at) if expires_at else max_expires_at
+        self.backend.set(key, dict(body=body, headers=headers), expires_at)
+
+    def invalidate(self):
+        """Remove all cached responses."""
+        if self.backend:
+            self.backend.clear()
+
+    def stats(self):
+        """Backend statistics, None if caching is disabled."""
+        return self.backend.stats() if self.backend else None
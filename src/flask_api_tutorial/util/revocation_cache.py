@@ -0,0 +1,183 @@
+"""In-process cache of revoked access tokens, kept in sync with the blacklist table."""
+import time
+from datetime import timedelta
+from threading import Lock
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from flask_api_tutorial.util.bloom_filter import BloomFilter
+from flask_api_tutorial.util.cache import LRUCache
+from flask_api_tutorial.util.datetime_util import utc_now
+
+
+class RevocationCache:
+    """Answer "is this token revoked?" without a database query when possible.
+
+    Tokens are identified by their digest (see BlacklistedToken.digest). The cache
+    holds every unexpired blacklisted token (up to a fixed limit), each entry is
+    evicted when the token itself expires. While the cache holds a complete copy of
+    the blacklist, a token that is not in the cache is known to be valid.
+    If the cache has overflowed, an optional Bloom filter built from the same rows
+    still rules out most valid tokens. Tokens blacklisted by other processes are
+    picked up by an incremental sync that runs at most once every
+    TOKEN_BLACKLIST_CACHE_SYNC_SECONDS. The sync loads every row whose id is higher
+    than the highest id already seen, plus every row blacklisted since the previous
+    sync started minus TOKEN_BLACKLIST_CACHE_SYNC_OVERLAP_SECONDS. The id catches
+    rows committed long after their blacklisted_on timestamp, the overlap window
+    catches ids that are reused (SQLite, after the newest rows are purged) or
+    committed out of order (server databases). The loader is called with both
+    bounds (None, None for a full load) and returns (id, token, expires_at) tuples.
+    """
+
+    def __init__(self, loader):
+        self.loader = loader
+        self.sync_seconds = 0
+        self.sync_overlap = timedelta(0)
+        self.bloom_filter_bytes = 0
+        self.bloom_filter_hashes = 7
+        self.bloom_filter = None
+        self.hits = 0
+        self.misses = 0
+        self.bloom_filter_negatives = 0
+        self.bloom_filter_false_positives = 0
+        self._revoked = LRUCache("TOKEN_BLACKLIST_CACHE_SIZE", max_size=0)
+        self._complete = False
+        self._last_seen_id = None
+        self._last_sync_started = None
+        self._last_sync_monotonic = 0.0
+        self._sync_lock = Lock()
+
+    def init_app(self, app):
+        """Configure the cache and warm it before the first request is handled."""
+        self.sync_seconds = app.config.get("TOKEN_BLACKLIST_CACHE_SYNC_SECONDS", 0)
+        self.sync_overlap = timedelta(
+            seconds=app.config.get("TOKEN_BLACKLIST_CACHE_SYNC_OVERLAP_SECONDS", 60)
+        )
+        self.bloom_filter_bytes = app.config.get("TOKEN_BLACKLIST_BLOOM_FILTER_BYTES", 0)
+        self.bloom_filter_hashes = app.config.get(
+            "TOKEN_BLACKLIST_BLOOM_FILTER_HASHES", 7
+        )
+        self._revoked.init_app(app)
+        self.clear()
+        app.before_first_request(self.sync)
+
+    @property
+    def enabled(self):
+        """Flag that indicates if either the token set or the Bloom filter is used."""
+        return self._revoked.enabled or bool(self.bloom_filter_bytes)
+
+    @property
+    def authoritative(self):
+        """True if every unexpired blacklisted token is currently in the cache."""
+        return self._complete and self._revoked.enabled and not self._revoked.evictions
+
+    def lookup(self, token):
+        """True/False if the cache knows the answer, None if the database must decide."""
+        if not self.enabled:
+            return None
+        if self._sync_due():
+            self.sync()
+        if self._revoked.get(token):
+            self.hits += 1
+            return True
+        if self.authoritative:
+            self.hits += 1
+            return False
+        if self._complete and self.bloom_filter and token not in self.bloom_filter:
+            self.bloom_filter_negatives += 1
+            return False
+        self.misses += 1
+        return None
+
+    def record_lookup(self, token, expires_at):
+        """Store the outcome of a database lookup that the cache could not answer.
+
+        expires_at is the UNIX timestamp of the blacklisted token, or None if the
+        database did not find the token (i.e., the Bloom filter gave a false positive).
+        """
+        if expires_at is None:
+            if self.bloom_filter:
+                self.bloom_filter_false_positives += 1
+            return
+        self._revoked.set(token, True, expires_at=expires_at)
+
+    def add(self, token, expires_at):
+        """Record a newly blacklisted token, expires_at is a UNIX timestamp."""
+        self._revoked.set(token, True, expires_at=expires_at)
+        if self.bloom_filter:
+            self.bloom_filter.add(token)
+
+    def sync(self):
+        """Load tokens blacklisted since the last sync (all tokens on first sync)."""
+        if not self.enabled or not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            started = utc_now()
+            after_id = since = None
+            if self._complete:
+                after_id = self._last_seen_id
+                since = self._last_sync_started - self.sync_overlap
+            elif self.bloom_filter_bytes:
+                self.bloom_filter = BloomFilter(
+                    self.bloom_filter_bytes, self.bloom_filter_hashes
+                )
+            last_seen_id = after_id or 0
+            for row_id, token, expires_at in self.loader(after_id, since):
+                self.add(token, expires_at)
+                last_seen_id = max(last_seen_id, row_id)
+        except SQLAlchemyError:
+            self._complete = False
+        else:
+            self._complete = True
+            self._last_seen_id = last_seen_id
+            self._last_sync_started = started
+        finally:
+            self._last_sync_monotonic = time.monotonic()
+            self._sync_lock.release()
+
+    def rebuild(self):
+        """Discard all cached state and reload the blacklist from the database."""
+        self.clear()
+        self.sync()
+
+    def clear(self):
+        """Remove all tokens and reset statistics, the next lookup triggers a sync."""
+        self._revoked.clear()
+        self.bloom_filter = None
+        self._complete = False
+        self._last_seen_id = None
+        self._last_sync_started = None
+        self.hits = 0
+        self.misses = 0
+        self.bloom_filter_negatives = 0
+        self.bloom_filter_false_positives = 0
+
+    def stats(self):
+        """Hit/miss counters and the current state of the cache."""
+        stats = dict(
+            hits=self.hits,
+            misses=self.misses,
+            size=len(self._revoked),
+            max_size=self._revoked.max_size,
+            evictions=self._revoked.evictions,
+            authoritative=self.authoritative,
+        )
+        if self.bloom_filter:
+            stats["bloom_filter"] = dict(
+                negatives=self.bloom_filter_negatives,
+                false_positives=self.bloom_filter_false_positives,
+                observed_false_positive_rate=self._observed_false_positive_rate(),
+                **self.bloom_filter.stats(),
+            )
+        return stats
+
+    def _observed_false_positive_rate(self):
+        checked = self.bloom_filter_negatives + self.bloom_filter_false_positives
+        return self.bloom_filter_false_positives / checked if checked else 0.0
+
+    def _sync_due(self):
+        if not self._complete:
+            return True
+        if not self.sync_seconds:
+            return False
+        return time.monotonic() - self._last_sync_monotonic >= self.sync_seconds
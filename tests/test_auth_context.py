@@ -0,0 +1,29 @@
+"""Unit tests for the request-local access token context."""
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+from flask import url_for
+
+from tests.util import EMAIL, ADMIN_EMAIL, login_user
+
+REQUESTS_PER_USER = 25
+
+
+def test_token_payload_is_request_local(app, client, db, user, admin):
+    url = url_for("api.auth_user")
+    tokens = {
+        email: login_user(client, email=email).json["access_token"]
+        for email in (EMAIL, ADMIN_EMAIL)
+    }
+
+    def get_user_email(email):
+        with app.test_client() as thread_client:
+            headers = {"Authorization": f"Bearer {tokens[email]}"}
+            response = thread_client.get(url, headers=headers)
+            assert response.status_code == HTTPStatus.OK
+            return email, response.json["email"]
+
+    emails = [EMAIL, ADMIN_EMAIL] * REQUESTS_PER_USER
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(get_user_email, emails))
+    assert all(requested == returned for requested, returned in results)
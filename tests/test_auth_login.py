@@ -1,7 +1,13 @@
 """Unit tests for api.auth_login API endpoint."""
 from http import HTTPStatus
 
+from flask_api_tutorial import password_hasher
 from flask_api_tutorial.models.user import User
+from flask_api_tutorial.util.password_hasher import (
+    PasswordHashPoolFull,
+    calibrate_rounds,
+    get_hash_rounds,
+)
 from tests.util import EMAIL, register_user, login_user
 
 SUCCESS = "successfully logged in"
@@ -29,3 +35,41 @@ def test_login_email_does_not_exist(client, db):
     assert response.status_code == HTTPStatus.UNAUTHORIZED
     assert "message" in response.json and response.json["message"] == UNAUTHORIZED
     assert "access_token" not in response.json
+
+
+def test_login_rehashes_password(app, client, db):
+    register_user(client)
+    assert get_hash_rounds(User.find_by_email(EMAIL).password_hash) == 4
+    app.config["BCRYPT_LOG_ROUNDS"] = 5
+    response = login_user(client)
+    assert response.status_code == HTTPStatus.OK
+    user = User.find_by_email(EMAIL)
+    assert get_hash_rounds(user.password_hash) == 5
+    assert not user.password_needs_rehash()
+    response = login_user(client)
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_login_skips_rehash_when_pool_full(app, client, db, monkeypatch):
+    register_user(client)
+    app.config["BCRYPT_LOG_ROUNDS"] = 5
+
+    def pool_full(password, rounds):
+        raise PasswordHashPoolFull(retry_after=1)
+
+    monkeypatch.setattr(password_hasher, "generate_password_hash", pool_full)
+    response = login_user(client)
+    assert response.status_code == HTTPStatus.OK
+    assert "access_token" in response.json
+    user = User.find_by_email(EMAIL)
+    assert get_hash_rounds(user.password_hash) == 4
+    assert user.password_needs_rehash()
+
+
+def test_calibrate_rounds():
+    rounds, timings = calibrate_rounds(target_ms=10000, max_rounds=6, samples=1)
+    assert rounds == 6
+    assert list(timings) == [4, 5, 6]
+    rounds, timings = calibrate_rounds(target_ms=0, max_rounds=6, samples=1)
+    assert rounds == 4
+    assert list(timings) == [4]
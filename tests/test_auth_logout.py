@@ -26,7 +26,8 @@ def test_logout(client, db):
     assert "message" in response.json and response.json["message"] == SUCCESS
     blacklist = BlacklistedToken.query.all()
     assert len(blacklist) == 1
-    assert access_token == blacklist[0].token
+    assert BlacklistedToken.digest(access_token) == blacklist[0].token_digest
+    assert blacklist[0].token is None
 
 
 def test_logout_token_blacklisted(client, db):
@@ -41,3 +42,16 @@ def test_logout_token_blacklisted(client, db):
     assert "message" in response.json and response.json["message"] == TOKEN_BLACKLISTED
     assert "WWW-Authenticate" in response.headers
     assert response.headers["WWW-Authenticate"] == WWW_AUTH_BLACKLISTED_TOKEN
+
+
+def test_logout_store_raw_token(app, client, db):
+    app.config["TOKEN_BLACKLIST_STORE_RAW_TOKEN"] = True
+    register_user(client)
+    response = login_user(client)
+    access_token = response.json["access_token"]
+    response = logout_user(client, access_token)
+    assert response.status_code == HTTPStatus.OK
+    blacklist = BlacklistedToken.query.all()
+    assert len(blacklist) == 1
+    assert access_token == blacklist[0].token
+    assert BlacklistedToken.digest(access_token) == blacklist[0].token_digest
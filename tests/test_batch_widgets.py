@@ -0,0 +1,106 @@
+"""Test cases for POST requests sent to the api.widget_batch API endpoint."""
+from datetime import date, timedelta
+from http import HTTPStatus
+
+from flask_api_tutorial.models.widget import Widget
+from tests.util import (
+    ADMIN_EMAIL,
+    EMAIL,
+    FORBIDDEN,
+    DEFAULT_URL,
+    login_user,
+    create_widget,
+    batch_widgets,
+)
+
+DEADLINE = (date.today() + timedelta(days=7)).strftime("%m/%d/%y")
+
+
+def test_batch_create_update_delete(client, db, admin):
+    response = login_user(client, email=ADMIN_EMAIL)
+    access_token = response.json["access_token"]
+    for name in ("existing", "doomed"):
+        response = create_widget(client, access_token, widget_name=name)
+        assert response.status_code == HTTPStatus.CREATED
+
+    operations = [
+        dict(op="create", name="new-widget", info_url=DEFAULT_URL, deadline=DEADLINE),
+        dict(
+            op="update",
+            name="existing",
+            info_url="https://www.new.com",
+            deadline=DEADLINE,
+        ),
+        dict(op="delete", name="doomed"),
+    ]
+    response = batch_widgets(client, access_token, operations)
+    assert response.status_code == HTTPStatus.OK
+    assert response.json["status"] == "success"
+    assert response.json["succeeded"] == 3 and response.json["failed"] == 0
+    statuses = [result["status"] for result in response.json["results"]]
+    assert statuses == ["created", "updated", "deleted"]
+
+    assert Widget.find_by_name("new-widget").owner.email == ADMIN_EMAIL
+    assert Widget.find_by_name("existing").info_url == "https://www.new.com"
+    assert Widget.find_by_name("existing").version == 2
+    assert not Widget.find_by_name("doomed")
+
+
+def test_batch_reports_failures_per_item(client, db, admin):
+    response = login_user(client, email=ADMIN_EMAIL)
+    access_token = response.json["access_token"]
+    response = create_widget(client, access_token, widget_name="existing")
+    assert response.status_code == HTTPStatus.CREATED
+
+    operations = [
+        dict(op="create", name="good", info_url=DEFAULT_URL, deadline=DEADLINE),
+        dict(op="create", name="bad name", info_url="ftp://x.com", deadline="1/1/2000"),
+        dict(op="create", name="existing", info_url=DEFAULT_URL, deadline=DEADLINE),
+        dict(op="update", name="missing", info_url=DEFAULT_URL, deadline=DEADLINE),
+        dict(op="delete", name="GOOD"),
+        dict(op="rename", name="existing"),
+        "not-an-object",
+    ]
+    response = batch_widgets(client, access_token, operations)
+    assert response.status_code == HTTPStatus.OK
+    assert response.json["status"] == "partial"
+    assert response.json["succeeded"] == 1 and response.json["failed"] == 6
+    results = response.json["results"]
+    assert results[0]["status"] == "created"
+    assert set(results[1]["errors"]) == {"name", "info_url", "deadline"}
+    assert "already exists" in results[2]["message"]
+    assert "not found" in results[3]["message"]
+    assert "more than one operation" in results[4]["errors"]["name"]
+    assert "op" in results[5]["errors"]
+    assert "operation" in results[6]["errors"]
+    assert Widget.find_by_name("good")
+
+
+def test_batch_create_many_widgets(client, db, admin):
+    response = login_user(client, email=ADMIN_EMAIL)
+    access_token = response.json["access_token"]
+    operations = [
+        dict(op="create", name=f"widget{i}", info_url=DEFAULT_URL, deadline=DEADLINE)
+        for i in range(2000)
+    ]
+    response = batch_widgets(client, access_token, operations)
+    assert response.status_code == HTTPStatus.OK
+    assert response.json["succeeded"] == 2000
+    assert Widget.query.count() == 2000
+
+
+def test_batch_too_many_operations(app, client, db, admin):
+    app.config["WIDGET_BATCH_MAX_OPERATIONS"] = 2
+    response = login_user(client, email=ADMIN_EMAIL)
+    access_token = response.json["access_token"]
+    operations = [dict(op="delete", name=f"widget{i}") for i in range(3)]
+    response = batch_widgets(client, access_token, operations)
+    assert response.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+
+
+def test_batch_no_admin_token(client, db, user):
+    response = login_user(client, email=EMAIL)
+    access_token = response.json["access_token"]
+    response = batch_widgets(client, access_token, [dict(op="delete", name="w")])
+    assert response.status_code == HTTPStatus.FORBIDDEN
+    assert "message" in response.json and response.json["message"] == FORBIDDEN
@@ -0,0 +1,56 @@
+"""Unit tests for the Bloom filter used to pre-filter blacklist lookups."""
+from http import HTTPStatus
+
+import pytest
+
+from flask_api_tutorial.models.token_blacklist import BlacklistedToken, revocation_cache
+from flask_api_tutorial.util.bloom_filter import BloomFilter
+from tests.util import register_user, login_user, get_user, logout_user
+
+
+@pytest.fixture
+def bloom_filter_only(app):
+    app.config["TOKEN_BLACKLIST_CACHE_SIZE"] = 0
+    app.config["TOKEN_BLACKLIST_BLOOM_FILTER_BYTES"] = 1024
+    revocation_cache.init_app(app)
+    return revocation_cache
+
+
+def test_bloom_filter_no_false_negatives():
+    bloom_filter = BloomFilter(size_bytes=1024, num_hashes=5)
+    items = [f"token-{i}" for i in range(500)]
+    for item in items:
+        bloom_filter.add(item)
+    assert all(item in bloom_filter for item in items)
+    assert bloom_filter.items_added == 500
+    assert 0 < bloom_filter.estimated_false_positive_rate < 0.1
+
+
+def test_bloom_filter_empty():
+    bloom_filter = BloomFilter(size_bytes=64)
+    assert "token" not in bloom_filter
+    assert bloom_filter.estimated_false_positive_rate == 0.0
+
+
+def test_valid_token_skips_database(client, db, bloom_filter_only):
+    register_user(client)
+    response = login_user(client)
+    access_token = response.json["access_token"]
+    response = get_user(client, access_token)
+    assert response.status_code == HTTPStatus.OK
+    stats = bloom_filter_only.stats()
+    assert stats["bloom_filter"]["negatives"] == 1
+    assert stats["misses"] == 0
+
+
+def test_logout_updates_bloom_filter(client, db, bloom_filter_only):
+    register_user(client)
+    response = login_user(client)
+    access_token = response.json["access_token"]
+    response = logout_user(client, access_token)
+    assert response.status_code == HTTPStatus.OK
+    token_digest = BlacklistedToken.digest(access_token)
+    assert token_digest in bloom_filter_only.bloom_filter
+    response = get_user(client, access_token)
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert bloom_filter_only.stats()["misses"] == 1
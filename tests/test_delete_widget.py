@@ -1,6 +1,9 @@
 """Test cases for GET requests sent to the api.widget API endpoint."""
 from http import HTTPStatus
 
+from sqlalchemy import event
+
+from flask_api_tutorial.models.widget import Widget
 from tests.util import (
     ADMIN_EMAIL,
     EMAIL,
@@ -38,3 +41,22 @@ def test_delete_widget_no_admin_token(client, db, admin, user):
     response = delete_widget(client, access_token, widget_name=DEFAULT_NAME)
     assert response.status_code == HTTPStatus.FORBIDDEN
     assert "message" in response.json and response.json["message"] == FORBIDDEN
+
+
+def test_delete_widget_modified_concurrently(client, db, admin):
+    response = login_user(client, email=ADMIN_EMAIL)
+    access_token = response.json["access_token"]
+    response = create_widget(client, access_token)
+    assert response.status_code == HTTPStatus.CREATED
+
+    # ANOTHER REQUEST UPDATES THE WIDGET AFTER IT WAS LOADED FOR DELETION
+    widget = Widget.__table__
+
+    @event.listens_for(db.session, "before_flush", once=True)
+    def concurrent_update(session, flush_context, instances):
+        session.execute(widget.update().values(version=widget.c.version + 1))
+
+    response = delete_widget(client, access_token, widget_name=DEFAULT_NAME)
+    assert response.status_code == HTTPStatus.PRECONDITION_FAILED
+    response = retrieve_widget(client, access_token, widget_name=DEFAULT_NAME)
+    assert response.status_code == HTTPStatus.OK
@@ -0,0 +1,48 @@
+"""Unit tests for database engine profiles and SQLite pragmas."""
+from sqlalchemy.pool import NullPool, QueuePool
+
+from flask_api_tutorial import db
+from flask_api_tutorial.config import ENGINE_PROFILES
+from flask_api_tutorial.util.engine_profile import engine_options
+
+
+def _pragmas(*names):
+    connection = db.session.connection()
+    return [connection.exec_driver_sql(f"PRAGMA {name}").scalar() for name in names]
+
+
+def test_default_profile_sqlite_pragmas(app, tmp_path):
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'default.db'}"
+    assert isinstance(db.engine.pool, QueuePool)
+    assert db.engine.pool.size() == ENGINE_PROFILES["default"]["pool_size"]
+    journal_mode, synchronous, busy_timeout = _pragmas(
+        "journal_mode", "synchronous", "busy_timeout"
+    )
+    assert journal_mode == "wal"
+    assert synchronous == 1
+    assert busy_timeout == 5000
+
+
+def test_production_profile_sqlite_pragmas(app, tmp_path):
+    app.config["DATABASE_ENGINE_PROFILE"] = "production"
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'prod.db'}"
+    assert db.engine.pool.size() == ENGINE_PROFILES["production"]["pool_size"]
+    assert _pragmas("journal_mode", "cache_size") == ["wal", -65536]
+
+
+def test_no_profile_uses_driver_defaults(app, tmp_path):
+    app.config["DATABASE_ENGINE_PROFILE"] = None
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'none.db'}"
+    assert isinstance(db.engine.pool, NullPool)
+    assert _pragmas("journal_mode") == ["delete"]
+
+
+def test_server_database_engine_options():
+    options = engine_options(ENGINE_PROFILES["production"], "postgresql+psycopg2")
+    assert options == dict(
+        pool_size=10,
+        max_overflow=20,
+        pool_timeout=30,
+        pool_recycle=1800,
+        pool_pre_ping=True,
+    )
@@ -0,0 +1,58 @@
+"""Test cases for GET requests sent to the api.widget_export API endpoint."""
+import csv
+import io
+import json
+from datetime import timedelta
+from http import HTTPStatus
+
+from flask_api_tutorial.models.widget import Widget
+from tests.util import EMAIL, login_user, add_widgets_with_owners, export_widgets
+
+
+def test_export_widgets_ndjson(client, db, user):
+    add_widgets_with_owners(db, 5)
+    response = login_user(client, email=EMAIL)
+    access_token = response.json["access_token"]
+    response = export_widgets(client, access_token)
+    assert response.status_code == HTTPStatus.OK
+    assert response.mimetype == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [row["name"] for row in rows] == [f"widget{i}" for i in range(5)]
+    assert rows[0]["owner_email"] == "owner0@email.com"
+    assert rows[0]["info_url"] == "https://www.widget0.com"
+
+
+def test_export_widgets_csv(app, client, db, user):
+    app.config["WIDGET_EXPORT_BATCH_SIZE"] = 2
+    add_widgets_with_owners(db, 3)
+    response = login_user(client, email=EMAIL)
+    access_token = response.json["access_token"]
+    response = export_widgets(client, access_token, export_format="csv")
+    assert response.status_code == HTTPStatus.OK
+    assert response.mimetype == "text/csv"
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [row["name"] for row in rows] == ["widget0", "widget1", "widget2"]
+    assert rows[2]["owner_email"] == "owner2@email.com"
+
+
+def test_export_widgets_since(client, db, user):
+    add_widgets_with_owners(db, 4)
+    widgets = Widget.query.order_by(Widget.id).all()
+    for i, widget in enumerate(widgets):
+        widget.created_at = widget.created_at - timedelta(days=len(widgets) - i)
+    db.session.commit()
+    since = widgets[2].created_at.isoformat() + "+00:00"
+    response = login_user(client, email=EMAIL)
+    access_token = response.json["access_token"]
+    response = export_widgets(client, access_token, since=since)
+    assert response.status_code == HTTPStatus.OK
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [row["name"] for row in rows] == ["widget2", "widget3"]
+
+
+def test_export_widgets_invalid_since(client, db, user):
+    response = login_user(client, email=EMAIL)
+    access_token = response.json["access_token"]
+    response = export_widgets(client, access_token, since="yesterday")
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert "since" in response.json["errors"]
@@ -0,0 +1,84 @@
+"""Unit tests for the bcrypt worker pool."""
+import threading
+import time
+from http import HTTPStatus
+
+import pytest
+
+from flask_api_tutorial import hash_pool_stats_task, password_hasher
+from flask_api_tutorial.util.password_hasher import PasswordHashPoolFull
+from tests.util import PASSWORD, login_user
+
+
+@pytest.fixture
+def single_worker(app):
+    app.config["PASSWORD_HASH_POOL_WORKERS"] = 1
+    app.config["PASSWORD_HASH_POOL_QUEUE_SIZE"] = 0
+    password_hasher.init_app(app)
+    yield password_hasher
+    password_hasher.shutdown()
+
+
+def test_hash_and_verify_password(app):
+    password_hash = password_hasher.generate_password_hash(PASSWORD, 4)
+    assert password_hash.startswith("$2b$04$")
+    assert password_hasher.check_password_hash(password_hash, PASSWORD)
+    assert not password_hasher.check_password_hash(password_hash, "wrong")
+    stats = password_hasher.stats()
+    assert stats["hash_time"]["count"] == 3
+    assert stats["queue_wait"]["count"] == 3
+    assert stats["in_flight"] == 0
+
+
+def test_hash_password_inline(app):
+    app.config["PASSWORD_HASH_POOL"] = None
+    password_hasher.init_app(app)
+    assert password_hasher.executor is None
+    password_hash = password_hasher.generate_password_hash(PASSWORD, 4)
+    assert password_hasher.check_password_hash(password_hash, PASSWORD)
+
+
+def test_login_pool_saturated(client, db, user, single_worker):
+    release = threading.Event()
+    blocker = threading.Thread(target=single_worker.run, args=(release.wait, 5))
+    blocker.start()
+    while not single_worker.in_flight:
+        time.sleep(0.01)
+    response = login_user(client)
+    release.set()
+    blocker.join()
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.headers["Retry-After"] == "1"
+    assert response.json["status"] == "fail"
+    assert single_worker.stats()["rejected"] == 1
+    response = login_user(client)
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_pool_counters_concurrent(app, single_worker):
+    def hash_many():
+        for _ in range(50):
+            try:
+                single_worker.run(len, PASSWORD)
+            except PasswordHashPoolFull:
+                pass
+
+    threads = [threading.Thread(target=hash_many) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = single_worker.stats()
+    assert stats["in_flight"] == 0
+    assert stats["hash_time"]["count"] + stats["rejected"] == 400
+
+
+def test_stats_task_logs_pool_usage(app, caplog):
+    password_hasher.generate_password_hash(PASSWORD, 4)
+    hash_pool_stats_task.init_app(app)
+    assert not hash_pool_stats_task.running
+    with caplog.at_level("INFO"):
+        stats = hash_pool_stats_task.run_once()
+    assert stats["hash_time"]["count"] == 1
+    assert hash_pool_stats_task.last_error is None
+    assert "Password hash pool: 0 in flight, 0 rejected, 1 hashed" in caplog.text
@@ -0,0 +1,122 @@
+"""Query plan tests that check every hot query is backed by an index."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from sqlalchemy.orm import joinedload
+
+from flask_api_tutorial.models.token_blacklist import BlacklistedToken
+from flask_api_tutorial.models.user import User
+from flask_api_tutorial.models.widget import Widget
+from tests.util import add_widgets_with_owners, query_plan
+
+NOW = datetime.utcnow()
+
+
+@pytest.fixture
+def widgets(db):
+    add_widgets_with_owners(db, 3)
+
+
+@pytest.mark.parametrize(
+    "filters, sort, index",
+    [
+        ({}, "created_at", "ix_widget_created_at_id"),
+        ({}, "deadline", "ix_widget_deadline_id"),
+        (
+            dict(deadline_after=NOW, deadline_before=NOW),
+            "deadline",
+            "ix_widget_deadline_id",
+        ),
+        (dict(deadline_passed=True), "deadline", "ix_widget_deadline_id"),
+        (dict(deadline_passed=False), "deadline", "ix_widget_deadline_id"),
+    ],
+)
+def test_widget_list_uses_index(widgets, db, filters, sort, index):
+    query = Widget.search(**filters).order_by(*Widget.list_order(sort)).limit(10)
+    plan = query_plan(db, query.all)
+    assert index in plan
+    assert "SCAN widget\n" not in plan + "\n"
+
+
+@pytest.mark.parametrize(
+    "sort, index",
+    [
+        ("created_at", "ix_widget_owner_id_created_at_id"),
+        ("deadline", "ix_widget_owner_id_deadline_id"),
+    ],
+)
+def test_owner_filter_uses_index(widgets, db, sort, index):
+    public_id = User.query.first().public_id
+    query = Widget.search(owner=public_id).order_by(*Widget.list_order(sort)).limit(10)
+    plan = query_plan(db, query.all)
+    assert f"{index} (owner_id=?)" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_name_prefix_filter_uses_index(widgets, db):
+    plan = query_plan(db, Widget.search(name_prefix="widget1").all)
+    assert (
+        "SEARCH widget USING INDEX sqlite_autoindex_widget_1 (name>? AND name<?)" in plan
+    )
+
+
+def test_keyset_page_uses_index(widgets, db):
+    query = (
+        Widget.search()
+        .filter(Widget.deadline > NOW - timedelta(days=1))
+        .order_by(*Widget.list_order("deadline"))
+        .limit(10)
+    )
+    plan = query_plan(db, query.all)
+    assert "SEARCH widget USING INDEX ix_widget_deadline_id (deadline>?)" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_widget_list_owner_join_uses_primary_key(widgets, db):
+    query = Widget.query.options(joinedload(Widget.owner))
+    query = query.order_by(*Widget.list_order()).limit(10)
+    plan = query_plan(db, query.all)
+    assert "USING INTEGER PRIMARY KEY (rowid=?)" in plan
+    assert "SCAN site_user" not in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_find_widget_by_name_ignores_case(widgets, db):
+    plan = query_plan(db, lambda: Widget.find_by_name("WIDGET1"))
+    assert "SEARCH widget USING INDEX ix_widget_name_lower (<expr>=?)" in plan
+
+
+@pytest.mark.parametrize(
+    "column, index",
+    [
+        ("email", "sqlite_autoindex_site_user_1 (email=?)"),
+        ("public_id", "sqlite_autoindex_site_user_2 (public_id=?)"),
+    ],
+)
+def test_find_user_uses_index(widgets, db, column, index):
+    value = getattr(User.query.first(), column)
+    find_user = getattr(User, f"find_by_{column}")
+    plan = query_plan(db, lambda: find_user(value))
+    assert f"SEARCH site_user USING INDEX {index}" in plan
+
+
+def test_check_blacklist_uses_index(db):
+    token_digest = BlacklistedToken.digest("token")
+    query = BlacklistedToken.query.filter_by(token_digest=token_digest)
+    plan = query_plan(db, query.first)
+    assert (
+        "SEARCH token_blacklist USING INDEX ix_token_blacklist_token_digest "
+        "(token_digest=?)" in plan
+    )
+
+
+def test_purge_expired_tokens_uses_index(db):
+    plan = query_plan(db, BlacklistedToken.find_unexpired)
+    assert "ix_token_blacklist_expires_at (expires_at>?)" in plan
+    plan = query_plan(db, lambda: BlacklistedToken.find_unexpired(5, NOW))
+    assert (
+        "token_blacklist USING" in plan and "SCAN token_blacklist\n" not in plan + "\n"
+    )
+    plan = query_plan(db, BlacklistedToken.purge_expired)
+    assert "ix_token_blacklist_expires_at (expires_at<?)" in plan
@@ -0,0 +1,99 @@
+"""Test cases for routing read-only queries to a read replica."""
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+
+from flask_api_tutorial import read_replicas, replica_sync_task, response_cache
+from flask_api_tutorial.models.token_blacklist import BlacklistedToken, revocation_cache
+from flask_api_tutorial.util.datetime_util import utc_now
+from tests.util import (
+    ADMIN_EMAIL,
+    DEFAULT_NAME,
+    create_widget,
+    get_user,
+    login_user,
+    register_user,
+    retrieve_widget,
+)
+
+
+@pytest.fixture
+def replica(app, tmp_path):
+    app.config["SQLALCHEMY_BINDS"] = dict(replica=f"sqlite:///{tmp_path / 'replica.db'}")
+    app.config["READ_REPLICA_BINDS"] = ("replica",)
+    app.config["READ_REPLICA_PIN_SECONDS"] = 0
+    app.config["RESPONSE_CACHE"] = None
+    read_replicas.init_app(app, app.extensions["sqlalchemy"].db)
+    response_cache.init_app(app)
+    return read_replicas
+
+
+def test_reads_use_replica(app, client, db, admin, replica):
+    replica_sync_task.run_once()
+    response = login_user(client, email=ADMIN_EMAIL)
+    assert response.status_code == HTTPStatus.OK
+    access_token = response.json["access_token"]
+    assert replica.replica_reads
+
+    response = create_widget(client, access_token)
+    assert response.status_code == HTTPStatus.CREATED
+    db.session.remove()
+
+    # WIDGET IS NOT VISIBLE UNTIL THE REPLICA IS UPDATED
+    response = retrieve_widget(client, access_token, widget_name=DEFAULT_NAME)
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    db.session.remove()
+    assert replica_sync_task.run_once() == 1
+    response = retrieve_widget(client, access_token, widget_name=DEFAULT_NAME)
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_read_after_write_uses_primary(app, client, db, admin, replica):
+    replica.pin_seconds = 60
+    replica_sync_task.run_once()
+    response = login_user(client, email=ADMIN_EMAIL)
+    access_token = response.json["access_token"]
+    response = create_widget(client, access_token)
+    assert response.status_code == HTTPStatus.CREATED
+    db.session.remove()
+
+    replica_reads = replica.replica_reads
+    response = retrieve_widget(client, access_token, widget_name=DEFAULT_NAME)
+    assert response.status_code == HTTPStatus.OK
+    assert replica.replica_reads == replica_reads
+    assert replica.primary_reads
+
+
+def test_no_replicas_configured(client, db, admin):
+    response = login_user(client, email=ADMIN_EMAIL)
+    assert response.status_code == HTTPStatus.OK
+    assert not read_replicas.replica_reads
+    assert replica_sync_task.run_once() == 0
+
+
+def test_revocation_cache_syncs_from_primary(app, client, db, admin, replica):
+    replica_sync_task.run_once()
+    response = login_user(client, email=ADMIN_EMAIL)
+    access_token = response.json["access_token"]
+    response = get_user(client, access_token)
+    assert response.status_code == HTTPStatus.OK
+    assert revocation_cache.authoritative
+
+    # ANOTHER PROCESS REVOKES THE TOKEN, THE REPLICA HAS NOT CAUGHT UP YET
+    expires_at = (utc_now() + timedelta(hours=1)).timestamp()
+    db.session.add(BlacklistedToken(access_token, expires_at))
+    db.session.commit()
+    db.session.remove()
+    read_replicas.read_only(revocation_cache.sync)()
+    assert revocation_cache.lookup(BlacklistedToken.digest(access_token))
+
+
+def test_registration_checks_email_on_primary(app, client, db, replica):
+    replica_sync_task.run_once()
+    response = register_user(client)
+    assert response.status_code == HTTPStatus.CREATED
+    db.session.remove()
+
+    response = register_user(client)
+    assert response.status_code == HTTPStatus.CONFLICT
@@ -0,0 +1,31 @@
+"""Unit tests for the per-request clock snapshot and the cached local UTC offset."""
+import time
+
+from flask_api_tutorial import request_clock
+from flask_api_tutorial.util import datetime_util
+from flask_api_tutorial.util.datetime_util import clock_snapshot, get_local_utcoffset
+
+
+def test_clock_snapshot_fixed_for_request(app):
+    with app.test_request_context():
+        request_clock.take_snapshot()
+        snapshot = clock_snapshot()
+        time.sleep(0.01)
+        assert clock_snapshot() == snapshot
+        request_clock.discard_snapshot()
+        assert clock_snapshot() > snapshot
+
+
+def test_local_utcoffset_looked_up_once(monkeypatch):
+    calls = []
+    system_localtime = time.localtime
+
+    def localtime(*args):
+        calls.append(args)
+        return system_localtime(*args)
+
+    datetime_util._local_utcoffset.cache_clear()
+    monkeypatch.setattr(datetime_util.time, "localtime", localtime)
+    offsets = {get_local_utcoffset() for _ in range(100)}
+    assert len(offsets) == 1
+    assert len(calls) <= 2
@@ -0,0 +1,87 @@
+"""Unit tests for the widget response cache and its storage backends."""
+import time
+from http import HTTPStatus
+
+from flask_api_tutorial import response_cache
+from flask_api_tutorial.util.response_cache import ResponseCache
+from tests.util import (
+    ADMIN_EMAIL,
+    DEFAULT_NAME,
+    login_user,
+    create_widget,
+    retrieve_widget,
+    retrieve_widget_list,
+    update_widget,
+    count_queries,
+)
+
+UPDATED_URL = "https://www.newurl.com"
+
+
+def test_widget_list_served_from_cache(client, db, admin):
+    response = login_user(client, email=ADMIN_EMAIL)
+    access_token = response.json["access_token"]
+    create_widget(client, access_token)
+    response = retrieve_widget_list(client, access_token, per_page=5)
+    assert response.status_code == HTTPStatus.OK
+    with count_queries(db) as statements:
+        cached = retrieve_widget_list(client, access_token, per_page=5)
+    assert cached.status_code == HTTPStatus.OK
+    assert cached.json == response.json
+    assert cached.headers["ETag"] == response.headers["ETag"]
+    assert cached.headers["Total-Count"] == "1"
+    assert not any("FROM widget" in statement for statement in statements)
+
+    response = create_widget(client, access_token, widget_name="second-widget")
+    assert response.status_code == HTTPStatus.CREATED
+    response = retrieve_widget_list(client, access_token, per_page=5)
+    assert response.json["total_items"] == 2
+
+
+def test_cached_widget_not_modified(client, db, admin):
+    response = login_user(client, email=ADMIN_EMAIL)
+    access_token = response.json["access_token"]
+    create_widget(client, access_token)
+    response = retrieve_widget(client, access_token, widget_name=DEFAULT_NAME)
+    etag = response.headers["ETag"]
+    with count_queries(db) as statements:
+        response = retrieve_widget(
+            client, access_token, DEFAULT_NAME, headers={"If-None-Match": etag}
+        )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert not any("FROM widget" in statement for statement in statements)
+
+
+def test_sqlite_backend_invalidated_by_update(app, client, db, admin, tmp_path):
+    app.config["RESPONSE_CACHE"] = "sqlite"
+    app.config["RESPONSE_CACHE_PATH"] = str(tmp_path / "cache.db")
+    response_cache.init_app(app)
+    response = login_user(client, email=ADMIN_EMAIL)
+    access_token = response.json["access_token"]
+    create_widget(client, access_token)
+    retrieve_widget(client, access_token, widget_name=DEFAULT_NAME)
+    assert response_cache.stats()["size"] == 1
+
+    # A SECOND CACHE USING THE SAME FILE SEES THE ENTRY
+    shared_cache = ResponseCache()
+    shared_cache.init_app(app)
+    assert shared_cache.stats()["size"] == 1
+
+    response = update_widget(
+        client, access_token, DEFAULT_NAME, UPDATED_URL, "12/31/2099"
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert shared_cache.stats()["size"] == 0
+    response = retrieve_widget(client, access_token, widget_name=DEFAULT_NAME)
+    assert response.json["info_url"] == UPDATED_URL
+
+
+def test_entry_expires_at_ttl_or_earlier(app):
+    app.config["RESPONSE_CACHE"] = "memory"
+    app.config["RESPONSE_CACHE_TTL_SECONDS"] = 60
+    cache = ResponseCache()
+    cache.init_app(app)
+    cache.set("/widgets", "{}", {"ETag": '"a"'})
+    cache.set("/widgets/a", "{}", {"ETag": '"b"'}, expires_at=time.time() - 1)
+    assert cache.get("/widgets") == dict(body="{}", headers={"ETag": '"a"'})
+    assert cache.get("/widgets/a") is None
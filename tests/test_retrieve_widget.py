@@ -10,6 +10,8 @@ from tests.util import (
     login_user,
     create_widget,
     retrieve_widget,
+    add_widgets_with_owners,
+    count_queries,
 )
 
 
@@ -43,3 +45,59 @@ def test_retrieve_widget_does_not_exist(client, db, user):
         "message" in response.json
         and f"{DEFAULT_NAME} not found in database" in response.json["message"]
     )
+
+
+def test_retrieve_widget_ignores_case(client, db, admin):
+    response = login_user(client, email=ADMIN_EMAIL)
+    access_token = response.json["access_token"]
+    response = create_widget(client, access_token, widget_name="tetraWIDG")
+    assert response.status_code == HTTPStatus.CREATED
+    for widget_name in ("tetraWIDG", "tetrawidg", "TETRAWIDG"):
+        response = retrieve_widget(client, access_token, widget_name=widget_name)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json["name"] == "tetraWIDG"
+
+    response = create_widget(client, access_token, widget_name="TetraWidg")
+    assert response.status_code == HTTPStatus.CONFLICT
+
+
+def test_retrieve_widget_loads_owner_eagerly(client, db, admin):
+    response = login_user(client, email=ADMIN_EMAIL)
+    access_token = response.json["access_token"]
+    add_widgets_with_owners(db, 1)
+    with count_queries(db) as statements:
+        response = retrieve_widget(client, access_token, widget_name="widget0")
+    assert response.status_code == HTTPStatus.OK
+    assert response.json["owner"]["email"] == "owner0@email.com"
+    assert not any(statement.startswith("SELECT site_user") for statement in statements)
+
+
+def test_retrieve_widget_not_modified(client, db, admin):
+    response = login_user(client, email=ADMIN_EMAIL)
+    access_token = response.json["access_token"]
+    response = create_widget(client, access_token)
+    assert response.status_code == HTTPStatus.CREATED
+    response = retrieve_widget(client, access_token, widget_name=DEFAULT_NAME)
+    assert response.status_code == HTTPStatus.OK
+    etag = response.headers["ETag"]
+    last_modified = response.headers["Last-Modified"]
+
+    response = retrieve_widget(
+        client, access_token, widget_name=DEFAULT_NAME, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+    assert not response.data
+
+    response = retrieve_widget(
+        client,
+        access_token,
+        widget_name=DEFAULT_NAME,
+        headers={"If-Modified-Since": last_modified},
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    response = retrieve_widget(
+        client, access_token, widget_name=DEFAULT_NAME, headers={"If-None-Match": '"x"'}
+    )
+    assert response.status_code == HTTPStatus.OK
@@ -1,8 +1,20 @@
 """Test cases for GET requests sent to the api.widget_list API endpoint."""
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta, timezone
 from http import HTTPStatus
 
-from tests.util import ADMIN_EMAIL, login_user, create_widget, retrieve_widget_list
+from flask import url_for
+from werkzeug.http import http_date
+
+from flask_api_tutorial import response_cache
+from tests.util import (
+    ADMIN_EMAIL,
+    login_user,
+    create_widget,
+    delete_widget,
+    retrieve_widget_list,
+    add_widgets_with_owners,
+    count_queries,
+)
 
 
 NAMES = [
@@ -139,3 +151,278 @@ def test_retrieve_paginated_widget_list(client, db, admin):
         assert "deadline" in item and DEADLINES[i] in item["deadline"]
         assert "owner" in item and "email" in item["owner"]
         assert item["owner"]["email"] == ADMIN_EMAIL
+
+
+def test_retrieve_widget_list_with_cursor(client, db, admin):
+    response = login_user(client, email=ADMIN_EMAIL)
+    assert "access_token" in response.json
+    access_token = response.json["access_token"]
+    for i in range(0, len(NAMES)):
+        response = create_widget(
+            client,
+            access_token,
+            widget_name=NAMES[i],
+            info_url=URLS[i],
+            deadline_str=DEADLINES[i],
+        )
+        assert response.status_code == HTTPStatus.CREATED
+
+    # REQUEST FIRST PAGE: EMPTY "after" CURSOR, 5 PER PAGE
+    response = retrieve_widget_list(client, access_token, per_page=5, after="")
+    assert response.status_code == HTTPStatus.OK
+    assert not response.json["has_prev"] and response.json["has_next"]
+    assert response.json["page"] is None and response.json["total_items"] is None
+    assert "Total-Count" not in response.headers
+    assert [item["name"] for item in response.json["items"]] == NAMES[:5]
+    links = response.json["links"]
+    assert "next" in links and "prev" not in links
+    assert 'rel="next"' in response.headers["Link"]
+
+    # FOLLOW "next" LINK
+    response = client.get(links["next"], headers=_auth_header(access_token))
+    assert response.status_code == HTTPStatus.OK
+    assert response.json["has_prev"] and not response.json["has_next"]
+    assert [item["name"] for item in response.json["items"]] == NAMES[5:]
+    links = response.json["links"]
+    assert "prev" in links and "next" not in links
+
+    # FOLLOW "prev" LINK BACK TO THE FIRST PAGE
+    response = client.get(links["prev"], headers=_auth_header(access_token))
+    assert response.status_code == HTTPStatus.OK
+    assert not response.json["has_prev"] and response.json["has_next"]
+    assert [item["name"] for item in response.json["items"]] == NAMES[:5]
+
+    # FOLLOW "last" LINK: EMPTY "before" CURSOR
+    response = client.get(links["last"], headers=_auth_header(access_token))
+    assert response.status_code == HTTPStatus.OK
+    assert response.json["has_prev"] and not response.json["has_next"]
+    assert [item["name"] for item in response.json["items"]] == NAMES[2:]
+
+
+def test_retrieve_widget_list_invalid_cursor(client, db, admin):
+    response = login_user(client, email=ADMIN_EMAIL)
+    access_token = response.json["access_token"]
+    response = retrieve_widget_list(client, access_token, after="not-a-cursor")
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert "after" in response.json["errors"]
+
+
+def test_retrieve_widget_list_count_modes(app, client, db, admin):
+    _disable_response_cache(app)
+    response = login_user(client, email=ADMIN_EMAIL)
+    access_token = response.json["access_token"]
+    for i in range(0, len(NAMES) - 1):
+        response = create_widget(
+            client,
+            access_token,
+            widget_name=NAMES[i],
+            info_url=URLS[i],
+            deadline_str=DEADLINES[i],
+        )
+        assert response.status_code == HTTPStatus.CREATED
+
+    # EXACT COUNT IS CACHED UNTIL A WIDGET IS ADDED
+    response = retrieve_widget_list(client, access_token, per_page=5)
+    assert response.json["count_mode"] == "exact"
+    assert response.json["total_items"] == 6
+    assert response.headers["Total-Count"] == "6"
+    response = retrieve_widget_list(client, access_token, per_page=5)
+    assert response.json["count_mode"] == "cached"
+    assert response.json["total_items"] == 6
+    response = create_widget(
+        client,
+        access_token,
+        widget_name=NAMES[-1],
+        info_url=URLS[-1],
+        deadline_str=DEADLINES[-1],
+    )
+    assert response.status_code == HTTPStatus.CREATED
+    response = retrieve_widget_list(client, access_token, per_page=5)
+    assert response.json["count_mode"] == "exact"
+    assert response.json["total_items"] == 7
+    assert response.json["total_pages"] == 2
+
+    # ESTIMATED COUNT
+    response = retrieve_widget_list(client, access_token, per_page=5, count="estimate")
+    assert response.json["count_mode"] == "estimate"
+    assert response.json["total_items"] == 7
+
+    # NO COUNT: TOTALS ARE UNKNOWN BUT has_next IS STILL ACCURATE
+    response = retrieve_widget_list(client, access_token, per_page=5, count="none")
+    assert response.status_code == HTTPStatus.OK
+    assert response.json["count_mode"] == "none"
+    assert response.json["total_items"] is None
+    assert response.json["total_pages"] is None
+    assert "Total-Count" not in response.headers
+    assert response.json["has_next"] and "last" not in response.json["links"]
+    response = retrieve_widget_list(
+        client, access_token, page=2, per_page=5, count="none"
+    )
+    assert not response.json["has_next"] and response.json["has_prev"]
+    assert len(response.json["items"]) == 2
+
+
+def test_retrieve_widget_list_loads_owners_eagerly(app, client, db, admin):
+    _disable_response_cache(app)
+    response = login_user(client, email=ADMIN_EMAIL)
+    access_token = response.json["access_token"]
+    add_widgets_with_owners(db, 10)
+    retrieve_widget_list(client, access_token, per_page=5)
+
+    statement_counts = []
+    for per_page in (5, 10):
+        db.session.expunge_all()
+        with count_queries(db) as statements:
+            response = retrieve_widget_list(client, access_token, per_page=per_page)
+        assert response.status_code == HTTPStatus.OK
+        owners = {item["owner"]["email"] for item in response.json["items"]}
+        assert len(owners) == per_page
+        statement_counts.append(len(statements))
+    assert statement_counts[0] == statement_counts[1]
+
+
+def test_retrieve_widget_list_not_modified(client, db, admin):
+    response = login_user(client, email=ADMIN_EMAIL)
+    access_token = response.json["access_token"]
+    add_widgets_with_owners(db, 3)
+    response = retrieve_widget_list(client, access_token, per_page=5)
+    assert response.status_code == HTTPStatus.OK
+    etag = response.headers["ETag"]
+
+    response = retrieve_widget_list(
+        client, access_token, per_page=5, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    # ADDING A WIDGET CHANGES THE PAGE, SO THE ETAG NO LONGER MATCHES
+    response = create_widget(client, access_token, widget_name="another-widget")
+    assert response.status_code == HTTPStatus.CREATED
+    response = retrieve_widget_list(
+        client, access_token, per_page=5, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["ETag"] != etag
+
+
+def test_retrieve_widget_list_modified_by_delete(client, db, admin):
+    response = login_user(client, email=ADMIN_EMAIL)
+    access_token = response.json["access_token"]
+    for name in NAMES[:3]:
+        response = create_widget(client, access_token, widget_name=name)
+        assert response.status_code == HTTPStatus.CREATED
+    response = retrieve_widget_list(client, access_token, per_page=5)
+    assert response.status_code == HTTPStatus.OK
+    assert "Last-Modified" not in response.headers
+    etag = response.headers["ETag"]
+    if_modified_since = http_date(datetime.now(timezone.utc) + timedelta(days=1))
+
+    # DELETING A WIDGET DOES NOT MOVE max(updated_at) OF THE REMAINING WIDGETS
+    response = delete_widget(client, access_token, NAMES[0])
+    assert response.status_code == HTTPStatus.NO_CONTENT
+    response = retrieve_widget_list(
+        client,
+        access_token,
+        per_page=5,
+        headers={"If-Modified-Since": if_modified_since},
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.json["items"]) == 2
+    response = retrieve_widget_list(
+        client, access_token, per_page=5, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["ETag"] != etag
+
+
+def test_retrieve_widget_list_filters(client, db, admin):
+    response = login_user(client, email=ADMIN_EMAIL)
+    access_token = response.json["access_token"]
+    for i in range(0, len(NAMES)):
+        response = create_widget(
+            client,
+            access_token,
+            widget_name=NAMES[i],
+            info_url=URLS[i],
+            deadline_str=DEADLINES[i],
+        )
+        assert response.status_code == HTTPStatus.CREATED
+    add_widgets_with_owners(db, 1)
+
+    # FILTER BY OWNER PUBLIC ID
+    public_id = client.get(
+        url_for("api.auth_user"), headers=_auth_header(access_token)
+    ).json["public_id"]
+    response = retrieve_widget_list(client, access_token, per_page=10, owner=public_id)
+    assert response.status_code == HTTPStatus.OK
+    assert response.json["total_items"] == len(NAMES)
+    assert {item["owner"]["email"] for item in response.json["items"]} == {ADMIN_EMAIL}
+
+    # FILTER BY DEADLINE RANGE
+    after = (date.today() + timedelta(days=4)).isoformat()
+    before = (date.today() + timedelta(days=20)).isoformat()
+    response = retrieve_widget_list(
+        client, access_token, deadline_after=after, deadline_before=before
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert [item["name"] for item in response.json["items"]] == NAMES[2:5] + ["widget0"]
+
+    # FILTER BY NAME PREFIX, FILTERS ARE KEPT IN NAVIGATION LINKS
+    response = retrieve_widget_list(client, access_token, per_page=5, name_prefix="se")
+    assert response.status_code == HTTPStatus.OK
+    assert response.json["total_items"] == 2
+    assert [item["name"] for item in response.json["items"]] == ["second_widget", "sep7"]
+    assert "name_prefix=se" in response.json["links"]["self"]
+
+    # NO WIDGET HAS A DEADLINE THAT HAS PASSED
+    response = retrieve_widget_list(client, access_token, deadline_passed="true")
+    assert response.status_code == HTTPStatus.OK
+    assert response.json["total_items"] == 0
+
+    # INVALID FILTER VALUE
+    response = retrieve_widget_list(client, access_token, deadline_after="soon")
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert "deadline_after" in response.json["errors"]
+
+
+def test_retrieve_widget_list_sort(client, db, admin):
+    response = login_user(client, email=ADMIN_EMAIL)
+    access_token = response.json["access_token"]
+    for i in reversed(range(0, len(NAMES))):
+        response = create_widget(
+            client,
+            access_token,
+            widget_name=NAMES[i],
+            info_url=URLS[i],
+            deadline_str=DEADLINES[i],
+        )
+        assert response.status_code == HTTPStatus.CREATED
+
+    response = retrieve_widget_list(client, access_token, per_page=10, sort="deadline")
+    assert [item["name"] for item in response.json["items"]] == NAMES
+    response = retrieve_widget_list(
+        client, access_token, per_page=10, sort="-created_at"
+    )
+    assert [item["name"] for item in response.json["items"]] == NAMES
+
+    # KEYSET PAGINATION FOLLOWS THE REQUESTED SORT ORDER
+    response = retrieve_widget_list(
+        client, access_token, per_page=5, after="", sort="-deadline"
+    )
+    assert [item["name"] for item in response.json["items"]] == NAMES[:1:-1]
+    assert "sort=-deadline" in response.json["links"]["next"]
+    response = client.get(
+        response.json["links"]["next"], headers=_auth_header(access_token)
+    )
+    assert [item["name"] for item in response.json["items"]] == NAMES[1::-1]
+
+    response = retrieve_widget_list(client, access_token, sort="name")
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def _disable_response_cache(app):
+    app.config["RESPONSE_CACHE"] = None
+    response_cache.init_app(app)
+
+
+def _auth_header(access_token):
+    return {"Authorization": f"Bearer {access_token}"}
@@ -0,0 +1,108 @@
+"""Unit tests for the in-process token revocation cache."""
+from datetime import timedelta
+from http import HTTPStatus
+
+from flask_api_tutorial.models.token_blacklist import (
+    BlacklistedToken,
+    revocation_cache,
+    revocation_cache_stats_task,
+)
+from flask_api_tutorial.util.datetime_util import utc_now
+from flask_api_tutorial.util.revocation_cache import RevocationCache
+from tests.util import register_user, login_user, get_user, logout_user
+
+
+def test_valid_token_served_from_cache(client, db):
+    register_user(client)
+    response = login_user(client)
+    access_token = response.json["access_token"]
+    hits_before = revocation_cache.hits
+    for _ in range(5):
+        response = get_user(client, access_token)
+        assert response.status_code == HTTPStatus.OK
+    assert revocation_cache.authoritative
+    assert revocation_cache.hits == hits_before + 5
+    assert revocation_cache.misses == 0
+
+
+def test_logout_adds_token_to_cache(client, db):
+    register_user(client)
+    response = login_user(client)
+    access_token = response.json["access_token"]
+    response = logout_user(client, access_token)
+    assert response.status_code == HTTPStatus.OK
+    assert revocation_cache.lookup(BlacklistedToken.digest(access_token))
+    response = get_user(client, access_token)
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert revocation_cache.misses == 0
+
+
+def test_cache_warms_from_blacklist_table(client, db):
+    register_user(client)
+    response = login_user(client)
+    access_token = response.json["access_token"]
+    response = logout_user(client, access_token)
+    assert response.status_code == HTTPStatus.OK
+    revocation_cache.clear()
+    assert revocation_cache.lookup(BlacklistedToken.digest(access_token))
+    assert revocation_cache.stats()["size"] == 1
+
+
+def test_sync_loads_row_committed_after_its_timestamp(client, db):
+    register_user(client)
+    response = login_user(client)
+    access_token = response.json["access_token"]
+    response = get_user(client, access_token)
+    assert response.status_code == HTTPStatus.OK
+    assert revocation_cache.authoritative
+
+    # ANOTHER PROCESS COMMITS A LOGOUT WHOSE blacklisted_on IS 3 SECONDS OLD
+    expires_at = (utc_now() + timedelta(hours=1)).timestamp()
+    blacklisted_token = BlacklistedToken(access_token, expires_at)
+    blacklisted_token.blacklisted_on = utc_now() - timedelta(seconds=3)
+    db.session.add(blacklisted_token)
+    db.session.commit()
+    revocation_cache.sync()
+    assert BlacklistedToken.check_blacklist(access_token)
+    response = get_user(client, access_token)
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_sync_loads_reused_id_after_purge(app, db):
+    other_process = RevocationCache(loader=BlacklistedToken.find_unexpired)
+    other_process.init_app(app)
+    expires_at = (utc_now() + timedelta(hours=1)).timestamp()
+    for i in range(3):
+        db.session.add(BlacklistedToken(f"token-{i}", expires_at))
+    db.session.commit()
+    for cache in (revocation_cache, other_process):
+        cache.sync()
+        assert cache.authoritative
+
+    # THE 3 TOKENS EXPIRE AND ARE PURGED, SQLITE REUSES THEIR IDS
+    BlacklistedToken.query.update(dict(expires_at=utc_now() - timedelta(seconds=1)))
+    db.session.commit()
+    assert BlacklistedToken.purge_expired().rows_purged == 3
+    blacklisted_token = BlacklistedToken("token-3", expires_at)
+    db.session.add(blacklisted_token)
+    db.session.commit()
+    assert blacklisted_token.id <= 3
+    digest = BlacklistedToken.digest("token-3")
+    for cache in (revocation_cache, other_process):
+        cache.sync()
+        assert cache.lookup(digest)
+
+
+def test_stats_task_logs_cache_usage(app, client, db, caplog):
+    register_user(client)
+    response = login_user(client)
+    access_token = response.json["access_token"]
+    response = get_user(client, access_token)
+    assert response.status_code == HTTPStatus.OK
+    revocation_cache_stats_task.init_app(app)
+    assert not revocation_cache_stats_task.running
+    with caplog.at_level("INFO"):
+        stats = revocation_cache_stats_task.run_once()
+    assert stats["hits"] == 1
+    assert "Revocation cache: 1 hits, 0 misses" in caplog.text
+    assert "authoritative=True" in caplog.text
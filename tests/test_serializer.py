@@ -0,0 +1,57 @@
+"""Unit tests for serializers compiled from flask-restx models."""
+from flask_restx import marshal
+from flask_restx.fields import Integer, List, Nested, String
+
+from flask_api_tutorial.api.widgets.dto import (
+    pagination_model,
+    widget_model,
+    serialize_pagination,
+    serialize_widget,
+)
+from flask_api_tutorial.models.widget import Widget
+from flask_api_tutorial.util.keyset_pagination import KeysetPagination
+from flask_api_tutorial.util.pagination import OffsetPagination
+from flask_api_tutorial.util.serializer import compile_model
+from tests.util import add_widgets_with_owners
+
+
+def test_serialize_widget_matches_marshal(db):
+    add_widgets_with_owners(db, 1)
+    widget = Widget.find_by_name("widget0")
+    assert _without_time_remaining(serialize_widget(widget)) == _without_time_remaining(
+        marshal(widget, widget_model)
+    )
+
+
+def test_serialize_pagination_matches_marshal(db):
+    add_widgets_with_owners(db, 7)
+    paginations = [
+        OffsetPagination(Widget.query, 1, 5, 7, "exact"),
+        OffsetPagination(Widget.query, 2, 5, None, "none"),
+        KeysetPagination(Widget.query, Widget.list_order(), 5, after=()),
+    ]
+    for pagination in paginations:
+        serialized = serialize_pagination(pagination)
+        marshalled = marshal(pagination, pagination_model)
+        assert list(serialized) == list(marshalled)
+        for item in serialized["items"] + marshalled["items"]:
+            _without_time_remaining(item)
+        assert serialized == marshalled
+
+
+def test_compile_model_skip_none_and_defaults():
+    model = {
+        "name": String,
+        "count": Integer(default=3),
+        "tags": List(Nested({"label": String})),
+    }
+    data = {"name": None, "tags": [{"label": "a"}, {"label": None}]}
+    assert compile_model(model)(data) == marshal(data, model)
+    assert compile_model(model, skip_none=True)(data) == marshal(
+        data, model, skip_none=True
+    )
+
+
+def _without_time_remaining(widget_dict):
+    widget_dict.pop("time_remaining")
+    return widget_dict
@@ -0,0 +1,42 @@
+"""Unit tests for purging expired tokens from the blacklist."""
+import time
+
+from flask_api_tutorial.models.token_blacklist import (
+    BlacklistedToken,
+    token_purge_task,
+)
+
+
+def add_blacklisted_tokens(db, count, expires_at):
+    for i in range(count):
+        db.session.add(BlacklistedToken(f"token-{expires_at}-{i}", expires_at))
+    db.session.commit()
+
+
+def test_purge_expired_tokens(db):
+    now = time.time()
+    add_blacklisted_tokens(db, 5, expires_at=now - 3600)
+    add_blacklisted_tokens(db, 3, expires_at=now + 3600)
+    result = BlacklistedToken.purge_expired(batch_size=2)
+    assert result.rows_purged == 5
+    assert result.batches == 3
+    assert result.elapsed_seconds > 0
+    assert BlacklistedToken.query.count() == 3
+
+
+def test_purge_nothing_expired(db):
+    add_blacklisted_tokens(db, 3, expires_at=time.time() + 3600)
+    result = BlacklistedToken.purge_expired(batch_size=2)
+    assert result.rows_purged == 0
+    assert result.batches == 0
+    assert BlacklistedToken.query.count() == 3
+
+
+def test_purge_task_run_once(app, db):
+    add_blacklisted_tokens(db, 4, expires_at=time.time() - 3600)
+    token_purge_task.init_app(app)
+    assert not token_purge_task.running
+    result = token_purge_task.run_once()
+    assert result.rows_purged == 4
+    assert token_purge_task.last_error is None
+    assert BlacklistedToken.query.count() == 0
@@ -9,6 +9,7 @@ from tests.util import (
     create_widget,
     retrieve_widget,
     update_widget,
+    count_queries,
 )
 
 UPDATED_URL = "https://www.newurl.com"
@@ -38,3 +39,106 @@ def test_update_widget(client, db, admin):
     assert "deadline" in response.json and UPDATED_DEADLINE in response.json["deadline"]
     assert "owner" in response.json and "email" in response.json["owner"]
     assert response.json["owner"]["email"] == ADMIN_EMAIL
+
+
+def test_update_widget_if_match(client, db, admin):
+    response = login_user(client, email=ADMIN_EMAIL)
+    access_token = response.json["access_token"]
+    response = create_widget(client, access_token)
+    assert response.status_code == HTTPStatus.CREATED
+    response = retrieve_widget(client, access_token, widget_name=DEFAULT_NAME)
+    etag = response.headers["ETag"]
+
+    response = update_widget(
+        client,
+        access_token,
+        widget_name=DEFAULT_NAME,
+        info_url=UPDATED_URL,
+        deadline_str=UPDATED_DEADLINE,
+        headers={"If-Match": etag},
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["ETag"] != etag
+
+    # STALE ETAG IS REJECTED AND THE WIDGET IS NOT CHANGED
+    response = update_widget(
+        client,
+        access_token,
+        widget_name=DEFAULT_NAME,
+        info_url="https://www.blind-overwrite.com",
+        deadline_str=UPDATED_DEADLINE,
+        headers={"If-Match": etag},
+    )
+    assert response.status_code == HTTPStatus.PRECONDITION_FAILED
+    response = retrieve_widget(client, access_token, widget_name=DEFAULT_NAME)
+    assert response.json["info_url"] == UPDATED_URL
+
+
+def test_update_widget_if_match_missing_widget(client, db, admin):
+    response = login_user(client, email=ADMIN_EMAIL)
+    access_token = response.json["access_token"]
+    response = update_widget(
+        client,
+        access_token,
+        widget_name=DEFAULT_NAME,
+        info_url=UPDATED_URL,
+        deadline_str=UPDATED_DEADLINE,
+        headers={"If-Match": "*"},
+    )
+    assert response.status_code == HTTPStatus.PRECONDITION_FAILED
+
+
+def test_update_widget_creates_missing_widget(client, db, admin):
+    response = login_user(client, email=ADMIN_EMAIL)
+    access_token = response.json["access_token"]
+    response = update_widget(
+        client,
+        access_token,
+        widget_name="New-Widget",
+        info_url=UPDATED_URL,
+        deadline_str=UPDATED_DEADLINE,
+    )
+    assert response.status_code == HTTPStatus.CREATED
+    assert response.headers["Location"].endswith("/widgets/new-widget")
+    assert response.headers["ETag"].endswith('.1"')
+    response = retrieve_widget(client, access_token, widget_name="new-widget")
+    assert response.status_code == HTTPStatus.OK
+    assert response.json["owner"]["email"] == ADMIN_EMAIL
+
+
+def test_update_widget_single_upsert(client, db, admin):
+    response = login_user(client, email=ADMIN_EMAIL)
+    access_token = response.json["access_token"]
+    response = create_widget(client, access_token, widget_name="tetraWIDG")
+    assert response.status_code == HTTPStatus.CREATED
+
+    with count_queries(db) as statements:
+        response = update_widget(
+            client,
+            access_token,
+            widget_name="TETRAwidg",
+            info_url=UPDATED_URL,
+            deadline_str=UPDATED_DEADLINE,
+        )
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["ETag"].endswith('.2"')
+    widget_statements = [s for s in statements if "widget" in s]
+    assert widget_statements[0].startswith("INSERT INTO widget")
+    assert "ON CONFLICT" in widget_statements[0]
+    assert not any(s.startswith("UPDATE") for s in widget_statements)
+    response = retrieve_widget(client, access_token, widget_name="tetraWIDG")
+    assert response.json["name"] == "tetraWIDG"
+    assert response.json["info_url"] == UPDATED_URL
+
+
+def test_update_widget_invalid_name(client, db, admin):
+    response = login_user(client, email=ADMIN_EMAIL)
+    access_token = response.json["access_token"]
+    response = update_widget(
+        client,
+        access_token,
+        widget_name="bad!name",
+        info_url=UPDATED_URL,
+        deadline_str=UPDATED_DEADLINE,
+    )
+    assert response.status_code == HTTPStatus.BAD_REQUEST
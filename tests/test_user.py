@@ -3,7 +3,8 @@ import json
 import time
 from base64 import urlsafe_b64encode, urlsafe_b64decode
 
-from flask_api_tutorial.models.user import User
+from flask_api_tutorial.models.token_blacklist import BlacklistedToken, revocation_cache
+from flask_api_tutorial.models.user import User, access_token_cache
 
 
 def test_encode_access_token(user):
@@ -20,6 +21,31 @@ def test_decode_access_token_success(user):
     assert user.admin == user_dict["admin"]
 
 
+def test_decode_access_token_cached(user):
+    access_token = user.encode_access_token()
+    hits_before = access_token_cache.hits
+    result = User.decode_access_token(access_token)
+    assert result.success
+    result = User.decode_access_token(access_token)
+    assert result.success
+    assert result.value["public_id"] == user.public_id
+    assert access_token_cache.hits == hits_before + 1
+
+
+def test_decode_access_token_cached_blacklisted(user, db):
+    access_token = user.encode_access_token()
+    result = User.decode_access_token(access_token)
+    assert result.success
+    expires_at = result.value["expires_at"]
+    blacklisted_token = BlacklistedToken(access_token, expires_at)
+    db.session.add(blacklisted_token)
+    db.session.commit()
+    revocation_cache.add(blacklisted_token.token_digest, expires_at)
+    result = User.decode_access_token(access_token)
+    assert not result.success
+    assert result.error == "Token blacklisted. Please log in again."
+
+
 def test_decode_access_token_expired(user):
     access_token = user.encode_access_token()
     time.sleep(6)
@@ -0,0 +1,46 @@
+"""Unit tests for the cached user identity used by authenticated requests."""
+from http import HTTPStatus
+
+from flask_api_tutorial.models.user import User, user_cache
+from tests.util import EMAIL, register_user, login_user, get_user, count_queries
+
+
+def test_get_user_served_from_cache(client, db):
+    register_user(client)
+    response = login_user(client)
+    access_token = response.json["access_token"]
+    response = get_user(client, access_token)
+    assert response.status_code == HTTPStatus.OK
+    with count_queries(db) as statements:
+        response = get_user(client, access_token)
+    assert response.status_code == HTTPStatus.OK
+    assert response.json["email"] == EMAIL
+    assert not any("site_user" in statement for statement in statements)
+
+
+def test_user_cache_disabled(app, client, db):
+    app.config["USER_CACHE_SIZE"] = 0
+    user_cache.init_app(app)
+    register_user(client)
+    response = login_user(client)
+    access_token = response.json["access_token"]
+    get_user(client, access_token)
+    with count_queries(db) as statements:
+        response = get_user(client, access_token)
+    assert response.status_code == HTTPStatus.OK
+    assert any("site_user" in statement for statement in statements)
+
+
+def test_user_update_invalidates_cache(client, db):
+    register_user(client)
+    response = login_user(client)
+    access_token = response.json["access_token"]
+    response = get_user(client, access_token)
+    assert not response.json["admin"]
+    user = User.find_by_email(EMAIL)
+    assert user_cache.get(user.public_id)
+    user.admin = True
+    db.session.commit()
+    assert not user_cache.get(user.public_id)
+    response = get_user(client, access_token)
+    assert response.json["admin"]
@@ -1,7 +1,13 @@
 """Shared functions and constants for unit tests."""
-from datetime import date
+from contextlib import contextmanager
+from datetime import date, timedelta
 
 from flask import url_for
+from sqlalchemy import event
+
+from flask_api_tutorial.models.user import User
+from flask_api_tutorial.models.widget import Widget
+from flask_api_tutorial.util.datetime_util import utc_now
 
 EMAIL = "new_user@email.com"
 ADMIN_EMAIL = "admin_user@email.com"
@@ -59,24 +65,61 @@ def create_widget(
     )
 
 
-def retrieve_widget_list(test_client, access_token, page=None, per_page=None):
+def retrieve_widget_list(
+    test_client,
+    access_token,
+    page=None,
+    per_page=None,
+    count=None,
+    after=None,
+    before=None,
+    headers=None,
+    sort=None,
+    **filters,
+):
     return test_client.get(
-        url_for("api.widget_list", page=page, per_page=per_page),
+        url_for(
+            "api.widget_list",
+            page=page,
+            per_page=per_page,
+            count=count,
+            after=after,
+            before=before,
+            sort=sort,
+            **filters,
+        ),
+        headers={"Authorization": f"Bearer {access_token}", **(headers or {})},
+    )
+
+
+def export_widgets(test_client, access_token, export_format=None, since=None):
+    return test_client.get(
+        url_for("api.widget_export", format=export_format, since=since),
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+
+
+def batch_widgets(test_client, access_token, operations):
+    return test_client.post(
+        url_for("api.widget_batch"),
         headers={"Authorization": f"Bearer {access_token}"},
+        json=dict(operations=operations),
     )
 
 
-def retrieve_widget(test_client, access_token, widget_name):
+def retrieve_widget(test_client, access_token, widget_name, headers=None):
     return test_client.get(
         url_for("api.widget", name=widget_name),
-        headers={"Authorization": f"Bearer {access_token}"},
+        headers={"Authorization": f"Bearer {access_token}", **(headers or {})},
     )
 
 
-def update_widget(test_client, access_token, widget_name, info_url, deadline_str):
+def update_widget(
+    test_client, access_token, widget_name, info_url, deadline_str, headers=None
+):
     return test_client.put(
         url_for("api.widget", name=widget_name),
-        headers={"Authorization": f"Bearer {access_token}"},
+        headers={"Authorization": f"Bearer {access_token}", **(headers or {})},
         data=f"info_url={info_url}&deadline={deadline_str}",
         content_type="application/x-www-form-urlencoded",
     )
@@ -87,3 +130,51 @@ def delete_widget(test_client, access_token, widget_name):
         url_for("api.widget", name=widget_name),
         headers={"Authorization": f"Bearer {access_token}"},
     )
+
+
+def add_widgets_with_owners(db, num_widgets):
+    deadline = utc_now() + timedelta(days=7)
+    for i in range(num_widgets):
+        owner = User(email=f"owner{i}@email.com", password=PASSWORD)
+        db.session.add(owner)
+        db.session.flush()
+        widget = Widget(
+            name=f"widget{i}",
+            info_url=f"https://www.widget{i}.com",
+            deadline=deadline,
+            owner_id=owner.id,
+        )
+        db.session.add(widget)
+    db.session.commit()
+    db.session.expunge_all()
+
+
+def query_plan(db, run_query):
+    executed = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, *args):
+        executed.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        run_query()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+    statement, parameters = executed[-1]
+    connection = db.session.connection()
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    return "\n".join(row[-1] for row in rows)
+
+
+@contextmanager
+def count_queries(db):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)